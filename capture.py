@@ -0,0 +1,152 @@
+import threading, time
+from collections import namedtuple
+
+import cv2
+
+########################################################################
+# Threaded video capture.
+# The grabber owns the cv2.VideoCapture and keeps only the newest frame in a
+# single-slot buffer, so slow YOLO/OCR work never makes the display drift
+# behind the camera. Every frame is stamped with time.monotonic() when it
+# was read so the consumer can decide whether it is too old to process.
+########################################################################
+
+# seq: increasing frame number, image: BGR ndarray, timestamp: time.monotonic() at read.
+CapturedFrame = namedtuple("CapturedFrame", ["seq", "image", "timestamp"])
+
+
+class LatestFrameSlot:
+    """Single-slot buffer: a new frame replaces whatever has not been consumed yet."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._closed = False
+        self.overwritten = 0  # frames replaced before any consumer saw them
+        self._taken_seq = 0
+
+    def put(self, frame: CapturedFrame):
+        with self._cond:
+            if self._frame is not None and self._frame.seq > self._taken_seq:
+                self.overwritten += 1
+            self._frame = frame
+            self._cond.notify_all()
+
+    def get(self, after_seq: int = 0, timeout: float = None):
+        """Return the newest frame with seq > after_seq, or None on timeout/close."""
+        with self._cond:
+            if not self._cond.wait_for(
+                    lambda: self._closed or (self._frame is not None and self._frame.seq > after_seq),
+                    timeout=timeout):
+                return None
+            if self._closed:
+                return None
+            self._taken_seq = max(self._taken_seq, self._frame.seq)
+            return self._frame
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FrameGrabber:
+    """Reads frames from a camera index or video file on a background thread.
+
+    Files are paced to their native FPS and rewound at the end (the same looping
+    behaviour the timer-driven reader had); cameras are read as fast as the
+    device delivers with the driver buffer shrunk to a single frame.
+    """
+
+    def __init__(self, source, loop_file: bool = True):
+        self.source = source
+        self.is_file = not isinstance(source, int)
+        self.loop_file = loop_file
+        self.slot = LatestFrameSlot()
+        self.cap = cv2.VideoCapture(source)
+        if not self.is_file:
+            try:
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            except Exception:
+                pass
+        fps = self.cap.get(cv2.CAP_PROP_FPS) if self.is_file else 0.0
+        self.frame_interval = 1.0 / fps if fps and fps > 0 else 0.0
+        self.frames_read = 0
+        self.read_failures = 0
+        self._seq = 0
+        self._running = threading.Event()
+        self._paused = threading.Event()
+        self._thread = None
+
+    def is_opened(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+
+    def start(self):
+        if self._thread is not None or not self.is_opened():
+            return self.is_opened()
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+        return True
+
+    def pause(self):
+        self._paused.set()
+
+    def resume(self):
+        self._paused.clear()
+
+    def stop(self):
+        self._running.clear()
+        self.slot.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def latest(self, after_seq: int = 0, timeout: float = None):
+        """Newest frame newer than after_seq (non-blocking when timeout is None/0)."""
+        return self.slot.get(after_seq, timeout=timeout if timeout else 0)
+
+    @staticmethod
+    def frame_age(frame: CapturedFrame) -> float:
+        return time.monotonic() - frame.timestamp
+
+    @staticmethod
+    def is_stale(frame: CapturedFrame, max_age: float) -> bool:
+        return max_age > 0 and FrameGrabber.frame_age(frame) > max_age
+
+    def stats(self) -> dict:
+        return {
+            "frames_read": self.frames_read,
+            "overwritten": self.slot.overwritten,
+            "read_failures": self.read_failures,
+        }
+
+    def _run(self):
+        next_due = time.monotonic()
+        while self._running.is_set():
+            if self._paused.is_set():
+                time.sleep(0.05)
+                next_due = time.monotonic()
+                continue
+            ret, image = self.cap.read()
+            if not ret:
+                if self.is_file and self.loop_file:
+                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    ret, image = self.cap.read()
+                if not ret:
+                    self.read_failures += 1
+                    time.sleep(0.05)
+                    continue
+            now = time.monotonic()
+            self._seq += 1
+            self.frames_read += 1
+            self.slot.put(CapturedFrame(self._seq, image, now))
+            if self.frame_interval:
+                # Keep files at real-time speed; a camera paces itself.
+                next_due = max(next_due + self.frame_interval, now - self.frame_interval)
+                delay = next_due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
@@ -0,0 +1,147 @@
+import re, threading, time
+from collections import OrderedDict, defaultdict
+
+########################################################################
+# DedupStore: plates logged within the last ttl seconds, so a plate that
+# re-enters the ROI as a new track is not logged again. Entries are kept
+# in the order they were logged, so expired ones are always at the front
+# and cleanup pops them in O(1) amortized time; a hard size cap evicts the
+# oldest entries if a busy lane logs more than max_size plates per ttl.
+# Times are wall-clock epoch seconds so seed() can restore the plates
+# logged in today's CSV (detection_log.parse_detections) after a restart.
+#
+# With max_distance > 0 the match is fuzzy: plates are compared on a key
+# with separators removed and look-alike characters folded (O/Q/D -> 0,
+# I/L -> 1, B -> 8, S -> 5, Z -> 2, G -> 6), and a key within max_distance
+# edits of a recent one counts as the same plate (66-HH-07 ~ 66-HH-O7).
+# Candidates come from a deletion-variant index (every key with up to
+# max_distance characters deleted), so a lookup costs O(len(plate)) dict
+# probes however many plates are stored.
+########################################################################
+
+CSV_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+CONFUSABLES = str.maketrans("OQDILBSZG", "000118526")
+
+
+def plate_key(plate: str) -> str:
+    return re.sub(r"[^0-9A-Z]", "", plate.upper()).translate(CONFUSABLES)
+
+
+def deletion_variants(key: str, max_distance: int) -> set:
+    """key and every string obtained by deleting up to max_distance characters from it."""
+    variants, frontier = {key}, {key}
+    for _ in range(max_distance):
+        frontier = {v[:i] + v[i + 1:] for v in frontier for i in range(len(v))}
+        variants |= frontier
+    return variants
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or limit + 1 once it is known to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class DedupStore:
+    def __init__(self, ttl: float = 60.0, max_size: int = 5000, max_distance: int = 0):
+        self.ttl = ttl
+        self.max_size = max(1, int(max_size))
+        self.max_distance = max(0, int(max_distance))  # 0 = exact plate text only
+        self.suppressed = 0   # duplicates that were not logged
+        self.fuzzy_matches = 0  # of those, matched only by the fuzzy index
+        self.expired = 0      # entries dropped after ttl
+        self.evicted = 0      # entries dropped by the size cap
+        self._entries = OrderedDict()  # plate -> (logged_at, plate_id), oldest first
+        self._variants = defaultdict(set)  # deletion variant of a key -> plates (fuzzy mode)
+        self._lock = threading.Lock()
+
+    def _fuzzy(self) -> bool:
+        return self.max_distance > 0
+
+    def _insert(self, plate: str, logged_at: float, plate_id):
+        self._entries[plate] = (logged_at, plate_id)
+        if self._fuzzy():
+            for variant in deletion_variants(plate_key(plate), self.max_distance):
+                self._variants[variant].add(plate)
+
+    def _pop_oldest(self):
+        plate, _ = self._entries.popitem(last=False)
+        if self._fuzzy():
+            for variant in deletion_variants(plate_key(plate), self.max_distance):
+                plates = self._variants.get(variant)
+                if plates is not None:
+                    plates.discard(plate)
+                    if not plates:
+                        del self._variants[variant]
+
+    def _cleanup(self, now: float):
+        while self._entries:
+            logged_at = next(iter(self._entries.values()))[0]
+            if now - logged_at < self.ttl:
+                break
+            self._pop_oldest()
+            self.expired += 1
+
+    def _match(self, plate: str):
+        """The stored plate that counts as plate, or None."""
+        if plate in self._entries:
+            return plate
+        if not self._fuzzy():
+            return None
+        key = plate_key(plate)
+        candidates = set()
+        for variant in deletion_variants(key, self.max_distance):
+            candidates |= self._variants.get(variant, set())
+        for candidate in candidates:
+            if edit_distance(key, plate_key(candidate), self.max_distance) <= self.max_distance:
+                return candidate
+        return None
+
+    def add(self, plate: str, plate_id, now: float = None) -> bool:
+        """Record plate as logged at now; False (and nothing recorded) if it was logged within ttl."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._cleanup(now)
+            match = self._match(plate)
+            if match is not None:
+                self.suppressed += 1
+                if match != plate:
+                    self.fuzzy_matches += 1
+                return False
+            self._insert(plate, now, plate_id)
+            while len(self._entries) > self.max_size:
+                self._pop_oldest()
+                self.evicted += 1
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._variants.clear()
+
+    def seed(self, rows) -> int:
+        """Record already-logged (logged_at, plate, plate_id) rows; returns how many were given."""
+        rows = sorted(rows, key=lambda r: r[0])
+        with self._lock:
+            for logged_at, plate, plate_id in rows:
+                if self._match(plate) is None:
+                    self._insert(plate, logged_at, plate_id)
+            while len(self._entries) > self.max_size:
+                self._pop_oldest()
+                self.evicted += 1
+        return len(rows)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "suppressed": self.suppressed, "fuzzy": self.fuzzy_matches,
+                    "expired": self.expired, "evicted": self.evicted}
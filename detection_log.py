@@ -0,0 +1,231 @@
+import io, os, sys, tempfile, threading, time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dedup import CSV_TIME_FORMAT
+
+########################################################################
+# Bulk loading of detections CSVs (data_log/detections_<date>.csv).
+# A file is parsed in one pandas call into one array per column, so a
+# table model is filled in one step.
+# DetectionLogLoader loads today's file for the live table on a background
+# thread while the main window is already up. It reads the file only up to
+# its size when the loader was created, so rows logged afterwards are
+# never loaded twice. HistoryLoader reads a list of day files for the data
+# view. The GUI polls state() from a QTimer; these threads never touch Qt
+# widgets.
+########################################################################
+
+CSV_COLUMNS = ["Timestamp", "Plate ID", "Plate Number", "OCR Confidence", "Plate Confidence"]
+
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+def count_rows(data: bytes) -> int:
+    return max(data.count(b"\n") - 1, 0)
+
+
+def read_columns(source) -> dict:
+    """One detections CSV (path or file object) -> {name: array} for CSV_COLUMNS.
+    Plate ID is int64 (0 if missing), the confidences float32, the text columns object arrays."""
+    df = pd.read_csv(source, usecols=CSV_COLUMNS, keep_default_na=False,
+                     dtype={"Plate Number": str, "Timestamp": str})
+    return {
+        "Timestamp": df["Timestamp"].to_numpy(dtype=object),
+        "Plate ID": pd.to_numeric(df["Plate ID"], errors="coerce").fillna(0).astype(np.int64).to_numpy(),
+        "Plate Number": df["Plate Number"].to_numpy(dtype=object),
+        "OCR Confidence": pd.to_numeric(df["OCR Confidence"], errors="coerce").fillna(0.0).to_numpy(np.float32),
+        "Plate Confidence": pd.to_numeric(df["Plate Confidence"], errors="coerce").fillna(0.0).to_numpy(np.float32),
+    }
+
+
+def parse_detections(data: bytes, recent_seconds: float = 60.0, now: float = None) -> dict:
+    """CSV bytes -> {"columns": arrays in live table order (Plate ID, Plate Number, OCR Confidence,
+    Plate Confidence, Timestamp), "last_id": highest Plate ID or None, "recent": (logged_at, plate,
+    plate_id) rows logged within recent_seconds of now}."""
+    now = time.time() if now is None else now
+    csv_columns = read_columns(io.BytesIO(data))
+    ids = csv_columns["Plate ID"]
+    plates = csv_columns["Plate Number"]
+    timestamps = csv_columns["Timestamp"]
+    columns = [ids, plates, csv_columns["OCR Confidence"], csv_columns["Plate Confidence"], timestamps]
+    # "%Y-%m-%d %H:%M:%S" sorts like the time it encodes, so only the last few rows need strptime.
+    cutoff = datetime.fromtimestamp(now - recent_seconds).strftime(CSV_TIME_FORMAT)
+    latest = datetime.fromtimestamp(now).strftime(CSV_TIME_FORMAT)
+    recent = []
+    for i in np.flatnonzero((timestamps >= cutoff) & (timestamps <= latest)):
+        try:
+            logged_at = datetime.strptime(timestamps[i], CSV_TIME_FORMAT).timestamp()
+        except ValueError:
+            continue
+        if plates[i]:
+            recent.append((logged_at, plates[i], int(ids[i])))
+    return {"columns": columns, "last_id": int(ids.max()) if len(ids) else None, "recent": recent}
+
+
+class DetectionLogLoader:
+    def __init__(self, path: str, recent_seconds: float = 60.0):
+        self.path = path
+        self.recent_seconds = recent_seconds
+        self.size = os.path.getsize(path)  # bytes present now; later appends are live rows
+        self.rows = None        # row count, known once the file is read
+        self.result = None      # parse_detections() output once READY
+        self.error = None
+        self.seconds = 0.0
+        self._state = LOADING
+        self._lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self._run, name="DetectionLogLoader", daemon=True).start()
+        return self
+
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read(self.size)
+            self.rows = count_rows(data)
+            result = parse_detections(data, self.recent_seconds)
+        except Exception as e:
+            with self._lock:
+                self.error = e
+                self._state = FAILED
+            return
+        self.seconds = time.perf_counter() - started
+        with self._lock:
+            self.result = result
+            self._state = READY
+
+
+class HistoryLoader:
+    def __init__(self, paths):
+        self.paths = list(paths)    # read in this order (date order for a range)
+        self.files_done = 0
+        self.rows = 0
+        self.failed = []            # (path, error) for files that could not be read
+        self.result = None          # {name: array} for CSV_COLUMNS once READY
+        self.error = None
+        self.seconds = 0.0
+        self._state = LOADING
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self._run, name="HistoryLoader", daemon=True).start()
+        return self
+
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _run(self):
+        started = time.perf_counter()
+        parts = {name: [] for name in CSV_COLUMNS}
+        for path in self.paths:
+            if self._cancelled:
+                return
+            try:
+                columns = read_columns(path)
+            except Exception as e:
+                self.failed.append((path, e))
+            else:
+                for name, values in columns.items():
+                    parts[name].append(values)
+                self.rows += len(columns["Timestamp"])
+            self.files_done += 1
+        with self._lock:
+            if self.paths and len(self.failed) == len(self.paths):
+                self.error = self.failed[0][1]
+                self._state = FAILED
+                return
+        # One concatenate per column: linear in the total number of rows.
+        empty = read_columns(io.StringIO(",".join(CSV_COLUMNS) + "\n"))
+        result = {name: np.concatenate(parts[name]) if parts[name] else empty[name] for name in CSV_COLUMNS}
+        self.seconds = time.perf_counter() - started
+        with self._lock:
+            self.result = result
+            self._state = READY
+
+
+########################################################################
+# Benchmark: synthetic day files of the given sizes.
+#   python detection_log.py --rows 10000 100000 1000000 --baseline 100000
+# "bulk" is what the loader thread does (read + parse + recent plates);
+# "iterrows" is read_csv plus the old per-row walk without building any
+# widgets, i.e. a lower bound for the old startup path.
+########################################################################
+
+def write_day_file(path: str, rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    times = start + np.sort(rng.uniform(0, 86399, rows))
+    letters = np.array(list("ABCDEFGHJKLMNPRSTUVWXYZ"))
+    plates = [f"TN{d:02d}{a}{b}{n:04d}" for d, a, b, n in zip(
+        rng.integers(1, 99, rows), letters[rng.integers(0, len(letters), rows)],
+        letters[rng.integers(0, len(letters), rows)], rng.integers(0, 9999, rows))]
+    pd.DataFrame({
+        "Timestamp": [datetime.fromtimestamp(t).strftime(CSV_TIME_FORMAT) for t in times],
+        "Plate ID": np.arange(1, rows + 1),
+        "Plate Number": plates,
+        "OCR Confidence": np.round(rng.uniform(0.4, 1.0, rows), 2),
+        "Plate Confidence": np.round(rng.uniform(0.4, 1.0, rows), 2),
+    }).to_csv(path, index=False)
+
+
+def _iterrows_load(path: str):
+    df = pd.read_csv(path)
+    rows = []
+    for _, r in df.iterrows():
+        ocr = float(r["OCR Confidence"]) if pd.notna(r["OCR Confidence"]) else 0.0
+        plate = float(r["Plate Confidence"]) if pd.notna(r["Plate Confidence"]) else 0.0
+        rows.append((str(r["Plate ID"]), str(r["Plate Number"]), ocr, plate, str(r["Timestamp"])))
+    return rows
+
+
+def benchmark(sizes, baseline_max: int = 100000):
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for rows in sizes:
+            path = os.path.join(folder, f"detections_{rows}.csv")
+            write_day_file(path, rows)
+            loader = DetectionLogLoader(path).start()
+            while loader.state() == LOADING:
+                time.sleep(0.005)
+            if loader.state() == FAILED:
+                raise loader.error
+            iterrows = None
+            if rows <= baseline_max:
+                started = time.perf_counter()
+                _iterrows_load(path)
+                iterrows = time.perf_counter() - started
+            results.append((rows, os.path.getsize(path), loader.seconds, iterrows))
+            print(f"{rows:>9,} rows: bulk {loader.seconds:.3f}s"
+                  + (f", iterrows {iterrows:.3f}s" if iterrows is not None else ""))
+    print("\n==== Detection log load ====")
+    print(f"{'rows':>10}{'MB':>8}{'bulk s':>9}{'iterrows s':>12}")
+    for rows, size, bulk, iterrows in results:
+        print(f"{rows:>10,}{size / 1e6:8.1f}{bulk:9.3f}" + (f"{iterrows:12.3f}" if iterrows is not None else f"{'-':>12}"))
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark loading a day's detections CSV")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--baseline", type=int, default=100000,
+                        help="also time the old iterrows path for files up to this many rows")
+    args = parser.parse_args()
+    if not args.rows:
+        sys.exit("No sizes to benchmark")
+    benchmark(args.rows, args.baseline)
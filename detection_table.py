@@ -0,0 +1,216 @@
+import numpy as np
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRectF
+from PySide6.QtGui import QColor, QPainter, QPen
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionViewItem, QApplication
+
+########################################################################
+# Detection tables (model/view).
+# ColumnTableModel keeps rows in a compact columnar store: one NumPy array
+# per column, grown by doubling, with object arrays only for text. Qt asks
+# for the cells of visible rows only, so a table of 100k rows costs a few
+# arrays instead of 100k * 5 items and 200k QProgressBar widgets. Sorting
+# is an argsort over one column that is applied as a row order, and a
+# filter is an array of the store rows to show; neither copies any data.
+# Appends arrive in batches with one beginInsertRows per batch. With a
+# page_size the view gets that many rows at a time (canFetchMore/fetchMore
+# as it scrolls to the end) however many rows a filter matches.
+# ConfidenceBarDelegate paints the 0..1 confidence columns as bars.
+########################################################################
+
+INT, FLOAT, TEXT = "int", "float", "text"
+DTYPES = {INT: np.int64, FLOAT: np.float32, TEXT: object}
+
+# Live detection log on the main window.
+DETECTION_COLUMNS = [("Plate ID", INT), ("Plate Number", TEXT), ("OCR Confidence", FLOAT),
+                     ("Plate Confidence", FLOAT), ("Timestamp", TEXT)]
+
+# History table in the data view (same order as the CSV files).
+HISTORY_COLUMNS = [("Timestamp", TEXT), ("Plate ID", INT), ("Plate Number", TEXT), ("OCR Conf", FLOAT),
+                   ("Plate Conf", FLOAT)]
+
+OCR_BAR_COLOR = "#3b82f6"
+PLATE_BAR_COLOR = "#10b981"
+
+
+class ColumnTableModel(QAbstractTableModel):
+    def __init__(self, columns, parent=None, capacity: int = 1024, page_size: int = None):
+        super().__init__(parent)
+        self.page_size = page_size
+        self._shown = page_size or 0   # rows handed to the view so far when paged
+        self.headers = [name for name, _ in columns]
+        self.kinds = [kind for _, kind in columns]
+        self._columns = [np.empty(capacity, DTYPES[kind]) for kind in self.kinds]
+        self._size = 0
+        self._rows = None        # store rows shown when filtered
+        self._order = None       # view row -> store row when sorted or filtered
+        self._sort = None        # (column, Qt.SortOrder)
+
+    # ---------------------------- Store ----------------------------
+    def _reserve(self, size: int):
+        capacity = len(self._columns[0])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for i, column in enumerate(self._columns):
+            grown = np.empty(capacity, column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[i] = grown
+
+    def column_values(self, column: int) -> np.ndarray:
+        return self._columns[column][:self._size]
+
+    def store_row(self, view_row: int) -> int:
+        return int(self._order[view_row]) if self._order is not None else view_row
+
+    def append_rows(self, rows):
+        """Append (value per column) tuples as one insert; appended rows are shown even when filtered."""
+        if not rows:
+            return
+        start, count = self._size, len(rows)
+        if self.page_size is not None:
+            self.beginResetModel()
+        elif self._order is not None:
+            self.layoutAboutToBeChanged.emit()
+        else:
+            self.beginInsertRows(QModelIndex(), start, start + count - 1)
+        self._reserve(start + count)
+        for i, values in enumerate(zip(*rows)):
+            self._columns[i][start:start + count] = values
+        self._size += count
+        if self._rows is not None:
+            self._rows = np.concatenate([self._rows, np.arange(start, start + count)])
+        if self.page_size is not None:
+            self._apply_sort()
+            self.endResetModel()
+        elif self._order is not None:
+            self._apply_sort()
+            self.layoutChanged.emit()
+        else:
+            self.endInsertRows()
+
+    def set_columns(self, arrays):
+        """Replace all rows with one array (or list) per column, in one reset."""
+        self.beginResetModel()
+        size = len(arrays[0]) if arrays else 0
+        self._columns = [np.empty(max(size, 1024), DTYPES[kind]) for kind in self.kinds]
+        for column, values in zip(self._columns, arrays):
+            column[:size] = values
+        self._size = size
+        self._rows = None
+        self._shown = self.page_size or 0
+        self._apply_sort()
+        self.endResetModel()
+
+    def clear(self):
+        self.set_columns([[] for _ in self.kinds])
+
+    def set_filter(self, rows):
+        """Show only these store rows (an index array, in store order), or all rows for None."""
+        self.beginResetModel()
+        self._rows = None if rows is None else np.asarray(rows, dtype=np.int64)
+        self._shown = self.page_size or 0
+        self._apply_sort()
+        self.endResetModel()
+
+    # ---------------------------- Qt model ----------------------------
+    def matched_rows(self) -> int:
+        """Rows passing the filter, shown or not yet fetched."""
+        return len(self._order) if self._order is not None else self._size
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self.page_size is None:
+            return self.matched_rows()
+        return min(self._shown, self.matched_rows())
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.page_size is not None and self._shown < self.matched_rows()
+
+    def fetchMore(self, parent=QModelIndex()):
+        shown = self.rowCount()
+        count = min(self.page_size, self.matched_rows() - shown)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), shown, shown + count - 1)
+        self._shown = shown + count
+        self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        value = self._columns[column][self.store_row(index.row())]
+        if role == Qt.DisplayRole:
+            if self.kinds[column] == FLOAT:
+                return f"{value:.2f}"
+            return str(value)
+        if role == Qt.UserRole:
+            return float(value) if self.kinds[column] == FLOAT else value
+        if role == Qt.TextAlignmentRole and self.kinds[column] != TEXT:
+            return int(Qt.AlignCenter)
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._sort = (column, order) if 0 <= column < len(self.kinds) else None
+        self._apply_sort()
+        self.layoutChanged.emit()
+
+    def _apply_sort(self):
+        rows = self._rows
+        if self._sort is None:
+            self._order = rows
+            return
+        column, order = self._sort
+        values = self.column_values(column)
+        if rows is not None:
+            values = values[rows]
+        if self.kinds[column] == TEXT:
+            values = values.astype(str)
+        order_index = np.argsort(values, kind="stable")
+        if order == Qt.DescendingOrder:
+            order_index = order_index[::-1]
+        self._order = order_index if rows is None else rows[order_index]
+
+
+class ConfidenceBarDelegate(QStyledItemDelegate):
+    """Paints a 0..1 value (Qt.UserRole) as a rounded progress bar with the value as text."""
+
+    def __init__(self, color: str, parent=None):
+        super().__init__(parent)
+        self.color = QColor(color)
+
+    def paint(self, painter, option, index):
+        # Background and selection as the view would draw them, without the text.
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+        value = index.data(Qt.UserRole)
+        value = min(max(float(value), 0.0), 1.0) if value is not None else 0.0
+        rect = QRectF(option.rect.adjusted(6, 5, -6, -5))
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setPen(Qt.NoPen)
+        track = QColor(option.palette.base().color())
+        track = track.darker(115) if track.lightness() > 128 else track.lighter(140)
+        painter.setBrush(track)
+        painter.drawRoundedRect(rect, 6, 6)
+        if value > 0:
+            painter.setBrush(self.color)
+            painter.drawRoundedRect(QRectF(rect.x(), rect.y(), rect.width() * value, rect.height()), 6, 6)
+        painter.setPen(QPen(option.palette.text().color()))
+        painter.drawText(rect, Qt.AlignCenter, f"{value:.2f}")
+        painter.restore()
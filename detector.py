@@ -0,0 +1,333 @@
+import os, time
+
+import cv2
+import numpy as np
+
+########################################################################
+# Plate detector backends.
+# Both return detections as an (N, 6) float32 array of
+# x1, y1, x2, y2, confidence, class in the coordinates of the input image,
+# the same layout as ultralytics' results[0].boxes.data.
+#   - UltralyticsDetector: best.pt through ultralytics on a CUDA GPU.
+#   - OnnxDetector: best.pt exported once to ONNX and run with ONNX Runtime
+#     on the CPU, for GPU-less lanes. The same class runs the INT8 model
+#     produced by calibrate_int8() from our own recorded footage.
+########################################################################
+
+BACKEND_AUTO = "auto"   # CUDA when available, otherwise ONNX on CPU
+BACKEND_CUDA = "cuda"
+BACKEND_ONNX = "onnx"
+BACKEND_ONNX_INT8 = "onnx-int8"
+BACKENDS = (BACKEND_AUTO, BACKEND_CUDA, BACKEND_ONNX, BACKEND_ONNX_INT8)
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv")
+
+EMPTY_DETECTIONS = np.zeros((0, 6), np.float32)
+
+
+def cuda_available() -> bool:
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except Exception:
+        return False
+
+
+class UltralyticsDetector:
+    name = "CUDA"
+
+    def __init__(self, weights: str, device: str = "cuda:0"):
+        from ultralytics import YOLO
+        self.model = YOLO(weights)
+        self.model.to(device)
+        self.device = 0 if device.startswith("cuda") else device
+
+    def detect(self, image) -> np.ndarray:
+        results = self.model(image, device=self.device, verbose=False)
+        if results and results[0].boxes is not None and len(results[0].boxes) > 0:
+            return results[0].boxes.data.cpu().numpy()
+        return EMPTY_DETECTIONS
+
+
+def export_onnx(weights: str, imgsz: int = 640) -> str:
+    """Export weights to ONNX next to the .pt file; reuses the export while it is newer than the weights."""
+    onnx_path = os.path.splitext(weights)[0] + ".onnx"
+    if os.path.exists(onnx_path) and os.path.getmtime(onnx_path) >= os.path.getmtime(weights):
+        return onnx_path
+    from ultralytics import YOLO
+    print(f"[Detector] Exporting {weights} to ONNX (one-time)...")
+    exported = YOLO(weights).export(format="onnx", imgsz=imgsz, dynamic=False)
+    if exported and os.path.abspath(str(exported)) != os.path.abspath(onnx_path):
+        os.replace(str(exported), onnx_path)
+    return onnx_path
+
+
+def letterbox(image, size: int):
+    """Resize keeping aspect ratio and pad to size x size; returns (padded, scale, (pad_x, pad_y))."""
+    h, w = image.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+    padded = np.full((size, size, 3), 114, np.uint8)
+    padded[pad_y:pad_y+new_h, pad_x:pad_x+new_w] = resized
+    return padded, scale, (pad_x, pad_y)
+
+
+class OnnxDetector:
+    name = "CPU (ONNX)"
+
+    def __init__(self, onnx_path: str, intra_op_threads: int = 0, inter_op_threads: int = 0,
+                 conf: float = 0.25, iou: float = 0.45, providers=None):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        # 0 lets ONNX Runtime pick (one thread per physical core).
+        options.intra_op_num_threads = int(intra_op_threads)
+        options.inter_op_num_threads = int(inter_op_threads)
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(onnx_path, sess_options=options,
+                                            providers=providers or ["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_dtype = np.float16 if "float16" in model_input.type else np.float32
+        shape = model_input.shape
+        self.imgsz = shape[2] if isinstance(shape[2], int) else 640
+        # Same defaults as ultralytics predict so both backends keep the same boxes.
+        self.conf = conf
+        self.iou = iou
+
+    def preprocess(self, image):
+        padded, scale, pad = letterbox(image, self.imgsz)
+        blob = cv2.dnn.blobFromImage(padded, 1.0 / 255.0, swapRB=True)
+        return blob.astype(self.input_dtype, copy=False), scale, pad
+
+    def postprocess(self, output, scale, pad, image_shape) -> np.ndarray:
+        pred = np.squeeze(output, axis=0).astype(np.float32)
+        if pred.shape[0] < pred.shape[1]:
+            pred = pred.T  # YOLOv8 export: (4 + classes, anchors) -> (anchors, 4 + classes)
+            class_scores = pred[:, 4:]
+        else:
+            # YOLOv5-style export: (anchors, 5 + classes) with objectness.
+            class_scores = pred[:, 5:] * pred[:, 4:5]
+        cls = class_scores.argmax(axis=1)
+        conf = class_scores[np.arange(len(cls)), cls]
+        keep = conf >= self.conf
+        if not np.any(keep):
+            return EMPTY_DETECTIONS
+        xywh, conf, cls = pred[keep, :4], conf[keep], cls[keep]
+        x1 = xywh[:, 0] - xywh[:, 2] / 2
+        y1 = xywh[:, 1] - xywh[:, 3] / 2
+        nms_boxes = np.stack([x1, y1, xywh[:, 2], xywh[:, 3]], axis=1)
+        idx = cv2.dnn.NMSBoxes(nms_boxes.tolist(), conf.tolist(), self.conf, self.iou)
+        idx = np.array(idx, dtype=np.int64).reshape(-1)
+        if idx.size == 0:
+            return EMPTY_DETECTIONS
+        boxes = np.stack([x1, y1, x1 + xywh[:, 2], y1 + xywh[:, 3]], axis=1)[idx]
+        # Undo the letterbox and clip to the input image.
+        boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad[0]) / scale
+        boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad[1]) / scale
+        h, w = image_shape[:2]
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+        order = np.argsort(-conf[idx])
+        return np.concatenate([boxes, conf[idx, None], cls[idx, None].astype(np.float32)], axis=1)[order].astype(np.float32)
+
+    def detect(self, image) -> np.ndarray:
+        blob, scale, pad = self.preprocess(image)
+        output = self.session.run(None, {self.input_name: blob})[0]
+        return self.postprocess(output, scale, pad, image.shape)
+
+
+def int8_path(weights: str) -> str:
+    return os.path.splitext(weights)[0] + ".int8.onnx"
+
+
+def create_detector(weights: str, backend: str = BACKEND_AUTO, intra_op_threads: int = 0, inter_op_threads: int = 0):
+    """Build the configured backend; auto picks CUDA when torch sees a GPU and ONNX on CPU otherwise."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown detector backend: {backend}")
+    if backend == BACKEND_CUDA or (backend == BACKEND_AUTO and cuda_available()):
+        return UltralyticsDetector(weights)
+    onnx_path = export_onnx(weights)
+    if backend == BACKEND_ONNX_INT8:
+        quantized = int8_path(weights)
+        if os.path.exists(quantized) and os.path.getmtime(quantized) >= os.path.getmtime(onnx_path):
+            detector = OnnxDetector(quantized, intra_op_threads, inter_op_threads)
+            detector.name = "CPU (ONNX INT8)"
+            return detector
+        # Calibration needs footage and a few minutes, so it is never run implicitly at startup.
+        print(f"[Detector] No up-to-date INT8 model at {quantized}; using FP32 ONNX. "
+              f"Run: python detector.py --calibrate sample_video")
+    return OnnxDetector(onnx_path, intra_op_threads, inter_op_threads)
+
+
+########################################################################
+# INT8 calibration.
+# Static quantization needs activation ranges, which are taken from frames
+# of our own recordings (same cameras, lighting and plate sizes as the
+# lanes) rather than a generic dataset. The calibration run prints an
+# accuracy-vs-speed report of the INT8 model against FP32 on those frames.
+########################################################################
+
+
+def sample_frames(sources, count: int = 200):
+    """About count BGR frames spread evenly over the given video files and/or folders of videos."""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(os.path.join(source, f) for f in sorted(os.listdir(source))
+                         if f.lower().endswith(VIDEO_EXTENSIONS))
+        else:
+            paths.append(source)
+    if not paths:
+        raise ValueError(f"No calibration videos found in {', '.join(sources)}")
+    frames = []
+    per_video = max(1, count // len(paths))
+    for path in paths:
+        cap = cv2.VideoCapture(path)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total <= 0:
+            print(f"[Calibrate] Skipping unreadable video {path}")
+            cap.release()
+            continue
+        for index in np.linspace(0, total - 1, min(per_video, total)).astype(int):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+            ret, frame = cap.read()
+            if ret:
+                frames.append(frame)
+        cap.release()
+    if not frames:
+        raise ValueError("Could not read any calibration frames")
+    return frames
+
+
+class FrameCalibrationReader:
+    """onnxruntime CalibrationDataReader over preprocessed frames (duck-typed: get_next/rewind)."""
+
+    def __init__(self, input_name: str, imgsz: int, frames):
+        self.blobs = [cv2.dnn.blobFromImage(letterbox(frame, imgsz)[0], 1.0 / 255.0, swapRB=True)
+                      for frame in frames]
+        self.input_name = input_name
+        self._index = 0
+
+    def get_next(self):
+        if self._index >= len(self.blobs):
+            return None
+        blob = self.blobs[self._index]
+        self._index += 1
+        return {self.input_name: blob}
+
+    def rewind(self):
+        self._index = 0
+
+
+def quantize_int8(onnx_path: str, output_path: str, frames) -> str:
+    """Static INT8 quantization (QDQ, per-channel weights) calibrated on frames."""
+    from onnxruntime.quantization import quantize_static, QuantFormat, QuantType, CalibrationMethod
+    reference = OnnxDetector(onnx_path)
+    reader = FrameCalibrationReader(reference.input_name, reference.imgsz, frames)
+    quantize_static(onnx_path, output_path, reader,
+                    quant_format=QuantFormat.QDQ,
+                    per_channel=True,
+                    weight_type=QuantType.QInt8,
+                    activation_type=QuantType.QUInt8,
+                    calibrate_method=CalibrationMethod.MinMax)
+    return output_path
+
+
+def _time_detect(detector, frames):
+    detector.detect(frames[0])  # warm-up; first run allocates
+    results, times = [], []
+    for frame in frames:
+        started = time.perf_counter()
+        results.append(detector.detect(frame))
+        times.append(1000.0 * (time.perf_counter() - started))
+    return results, np.array(times)
+
+
+def _match(reference, candidate, iou_threshold: float = 0.5):
+    """Greedy IoU match; returns (matched ref boxes, list of matched IoUs, list of conf deltas)."""
+    from tracker import box_iou
+    used, ious, deltas = set(), [], []
+    for ref in reference:
+        best, best_iou = None, iou_threshold
+        for ci, cand in enumerate(candidate):
+            if ci in used:
+                continue
+            iou = box_iou(ref, cand)
+            if iou >= best_iou:
+                best, best_iou = ci, iou
+        if best is not None:
+            used.add(best)
+            ious.append(best_iou)
+            deltas.append(float(candidate[best][4] - ref[4]))
+    return len(ious), ious, deltas
+
+
+def compare_detectors(fp32, int8, frames) -> dict:
+    """Accuracy-vs-speed of int8 against fp32 on the same frames (fp32 boxes are the reference)."""
+    fp32_results, fp32_ms = _time_detect(fp32, frames)
+    int8_results, int8_ms = _time_detect(int8, frames)
+    ref_boxes = int8_boxes = matched = 0
+    ious, deltas = [], []
+    for ref, cand in zip(fp32_results, int8_results):
+        ref_boxes += len(ref)
+        int8_boxes += len(cand)
+        m, frame_ious, frame_deltas = _match(ref, cand)
+        matched += m
+        ious.extend(frame_ious)
+        deltas.extend(frame_deltas)
+    return {
+        "frames": len(frames),
+        "fp32_ms": float(fp32_ms.mean()), "fp32_p95_ms": float(np.percentile(fp32_ms, 95)),
+        "int8_ms": float(int8_ms.mean()), "int8_p95_ms": float(np.percentile(int8_ms, 95)),
+        "speedup": float(fp32_ms.mean() / int8_ms.mean()) if int8_ms.mean() > 0 else 0.0,
+        "fp32_boxes": ref_boxes, "int8_boxes": int8_boxes,
+        "recall": matched / ref_boxes if ref_boxes else 1.0,
+        "precision": matched / int8_boxes if int8_boxes else 1.0,
+        "mean_iou": float(np.mean(ious)) if ious else 0.0,
+        "mean_conf_delta": float(np.mean(deltas)) if deltas else 0.0,
+    }
+
+
+def print_report(report: dict):
+    print("\n==== INT8 vs FP32 detector ====")
+    print(f"Frames:           {report['frames']}")
+    print(f"FP32:             {report['fp32_ms']:.1f} ms/frame (p95 {report['fp32_p95_ms']:.1f}) "
+          f"= {1000.0 / max(report['fp32_ms'], 1e-6):.1f} FPS")
+    print(f"INT8:             {report['int8_ms']:.1f} ms/frame (p95 {report['int8_p95_ms']:.1f}) "
+          f"= {1000.0 / max(report['int8_ms'], 1e-6):.1f} FPS")
+    print(f"Speed-up:         {report['speedup']:.2f}x")
+    print(f"Boxes FP32/INT8:  {report['fp32_boxes']} / {report['int8_boxes']}")
+    print(f"Recall vs FP32:   {100 * report['recall']:.1f}%  (IoU >= 0.5)")
+    print(f"Precision vs FP32: {100 * report['precision']:.1f}%")
+    print(f"Mean IoU:         {report['mean_iou']:.3f}")
+    print(f"Mean conf delta:  {report['mean_conf_delta']:+.3f}")
+
+
+def calibrate_int8(weights: str, sources, count: int = 200, intra_op_threads: int = 0) -> dict:
+    """Export, quantize next to the weights (<name>.int8.onnx) and report against FP32."""
+    onnx_path = export_onnx(weights)
+    frames = sample_frames(sources, count)
+    print(f"[Calibrate] {len(frames)} frames from {', '.join(sources)}")
+    output_path = quantize_int8(onnx_path, int8_path(weights), frames)
+    print(f"[Calibrate] INT8 model written to {output_path}")
+    report = compare_detectors(OnnxDetector(onnx_path, intra_op_threads),
+                               OnnxDetector(output_path, intra_op_threads), frames)
+    print_report(report)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Plate detector tools")
+    parser.add_argument("--weights", default=os.path.join("model", "best.pt"))
+    parser.add_argument("--calibrate", nargs="+", metavar="VIDEO_OR_DIR",
+                        help="build the INT8 model from frames of these videos (e.g. sample_video)")
+    parser.add_argument("--frames", type=int, default=200, help="calibration frames to sample")
+    parser.add_argument("--threads", type=int, default=0, help="ONNX Runtime intra-op threads")
+    args = parser.parse_args()
+    if args.calibrate:
+        calibrate_int8(args.weights, args.calibrate, args.frames, args.threads)
+    else:
+        parser.print_help()
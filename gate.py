@@ -1,20 +1,68 @@
-import sys, os, json, csv, glob, zipfile, cv2, numpy as np, pandas as pd, re, time
+import sys, os, json, csv, glob, zipfile, re, time, threading, multiprocessing
+from collections import Counter
 from datetime import datetime
 
+########################################################################
+# Startup timing. Inference libraries (torch, ultralytics, paddleocr,
+# onnxruntime) and pyserial are imported only where they are used, so the
+# login, history viewer and exports never load them; the detection engine
+# loads when a video source starts (or at launch with preload_models).
+# startup_step() records how long each import group and startup phase took.
+########################################################################
+STARTUP_TIMES = []  # (step, seconds)
+INFERENCE_MODULES = ("torch", "ultralytics", "paddle", "paddleocr", "onnxruntime", "serial")
+
+
+def startup_step(step: str, since: float) -> float:
+    now = time.perf_counter()
+    STARTUP_TIMES.append((step, now - since))
+    return now
+
+
+def print_startup_report():
+    print("==== Startup timing ====")
+    for step, secs in STARTUP_TIMES:
+        print(f"{step:<28}{1000.0 * secs:8.0f} ms")
+    print(f"{'total':<28}{1000.0 * sum(secs for _, secs in STARTUP_TIMES):8.0f} ms")
+    loaded = [name for name in INFERENCE_MODULES if name in sys.modules]
+    print(f"Heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+
+
+_t = time.perf_counter()
+import cv2
+_t = startup_step("import cv2", _t)
+import pandas as pd
+_t = startup_step("import pandas", _t)
+
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QFileDialog, QVBoxLayout, QWidget,
-    QHBoxLayout, QLabel, QMessageBox, QTableWidget, QTableWidgetItem, QDialog,
+    QHBoxLayout, QLabel, QMessageBox, QTableView, QDialog,
     QGroupBox, QFormLayout, QDialogButtonBox, QMenuBar, QMenu, QDoubleSpinBox,
     QListWidget, QListWidgetItem, QLineEdit, QHeaderView, QSplitter, QDateEdit, QGridLayout, QComboBox,
-    QSizePolicy, QToolBar, QStatusBar, QStyle, QAbstractItemView, QCheckBox, QStyleFactory, QFrame, QProgressBar, QGraphicsDropShadowEffect
+    QSizePolicy, QToolBar, QStatusBar, QStyle, QAbstractItemView, QCheckBox, QStyleFactory, QFrame, QProgressBar, QGraphicsDropShadowEffect, QSplashScreen
 )
-from PySide6.QtCore import QTimer, Qt, QDate, QPoint, QSettings, QCoreApplication
+from PySide6.QtCore import QTimer, Qt, QDate, QPoint, QRect, QSettings, QCoreApplication
 from PySide6.QtGui import QImage, QPixmap, QPainter, QPen, QAction, QPalette, QColor, QFont, QIcon, QLinearGradient, QBrush
+_t = startup_step("import PySide6", _t)
+
+from capture import FrameGrabber
+from pipeline import Pipeline, FrameJob, DROP_POLICIES, DROP_OLDEST
+from ocr_engine import read_plates, DEFAULT_PLATE_PATTERN, PATH_CACHE
+from ocr_cache import OcrCache, plate_hash
+from dedup import DedupStore
+from tracker import PlateTracker
+from motion import MotionGate, FrameRateGovernor
+from detector import BACKENDS, BACKEND_AUTO
+from model_loader import ModelLoader, LOADING, READY
+from roi import RoiCache, box_tuples
+from preprocess import PreprocessChain
+from plate_index import PlateSearch
+from merged_export import MergedExport, cell_columns, RUNNING as EXPORT_RUNNING, DONE as EXPORT_DONE, CANCELLED as EXPORT_CANCELLED
+from detection_log import DetectionLogLoader, HistoryLoader, CSV_COLUMNS, LOADING as LOG_LOADING, READY as LOG_READY
+from detection_table import (ColumnTableModel, ConfidenceBarDelegate, DETECTION_COLUMNS, HISTORY_COLUMNS,
+                             OCR_BAR_COLOR, PLATE_BAR_COLOR)
+_t = startup_step("import engine modules", _t)
 
-from ultralytics import YOLO
-from paddleocr import PaddleOCR
-import serial
-import serial.tools.list_ports
 from typing import Optional
 
 # Set the data log directory and ensure it exists.
@@ -25,6 +73,82 @@ os.makedirs(DATA_LOG_DIR, exist_ok=True)
 ROI_SETTINGS_FILE = os.path.join(DATA_LOG_DIR, "roi_settings.json")
 SETTINGS_FILE = os.path.join(DATA_LOG_DIR, "settings.json")
 
+# Plate detector weights; the ONNX export for CPU lanes is cached next to this file.
+MODEL_PATH = r"D:\peer\kvcet_vehicle\model\best.pt"
+
+# Frames older than this (seconds since capture) are dropped instead of processed.
+MAX_FRAME_AGE = 0.5
+
+# Defaults for settings.json; keys missing from the file fall back to these.
+DEFAULT_SETTINGS = {
+    "plate_confidence_threshold": 0.4,
+    "ocr_confidence_threshold": 0.4,
+    # Pipeline queues between capture -> detect -> ocr -> sink.
+    "pipeline_queue_size": 2,
+    "pipeline_drop_policy": DROP_OLDEST,
+    # OCR worker processes (0 = single in-process reader) and CPU threads per worker.
+    "ocr_workers": 2,
+    "ocr_threads_per_worker": 2,
+    # Send single-line YOLO crops straight to the recognizer, skipping PaddleOCR text detection.
+    "ocr_rec_only": True,
+    # Recognise all crops of a frame (or of frames arriving within the window) as one padded batch.
+    "ocr_batch": True,
+    "ocr_batch_window_ms": 0,
+    "ocr_max_batch": 16,
+    # Crop preprocessing before OCR: a preset from preprocess.PRESETS ("default" is
+    # CLAHE + 1.5x + NLMeans, "fast" is grey + resize to 48 px) or a list of stages
+    # such as ["gray", "clahe", "resize_height:height=48", "median:ksize=3"].
+    # Compare them with `python preprocess.py --video sample_video`.
+    "ocr_preprocess": "default",
+    # Two-pass OCR: read every single-line crop with the cheap ocr_fast_preprocess chain
+    # first and use ocr_preprocess only when that reading is below the OCR threshold or
+    # does not match ocr_plate_pattern, a regex checked with separators removed
+    # (empty = no format check; ocr_engine.INDIAN_PLATE_PATTERN for Indian-only lanes).
+    "ocr_two_pass": True,
+    "ocr_fast_preprocess": "fast",
+    "ocr_plate_pattern": DEFAULT_PLATE_PATTERN,
+    # Reuse the OCR result of a near-identical crop (perceptual hash within
+    # ocr_cache_max_distance bits) read less than ocr_cache_ttl seconds ago.
+    "ocr_cache": True,
+    "ocr_cache_size": 256,
+    "ocr_cache_ttl": 3.0,
+    "ocr_cache_max_distance": 6,
+    # Plates remembered for duplicate suppression (per detection_interval); oldest evicted beyond this.
+    "dedup_max_plates": 5000,
+    # Treat OCR variants of a recent plate as the same plate: separators ignored, O/0, I/1,
+    # B/8 etc. folded, and up to this many character edits allowed (0 = exact text only).
+    "dedup_max_distance": 1,
+    # Plate tracker between YOLO and OCR: OCR each track at most every
+    # ocr_track_interval seconds, up to ocr_max_per_track times, and stop once
+    # the per-character vote leads by ocr_consensus_margin (summed confidence).
+    "tracker_iou_threshold": 0.3,
+    "tracker_max_age": 1.0,
+    "ocr_track_interval": 0.5,
+    "ocr_max_per_track": 10,
+    "ocr_consensus_margin": 1.5,
+    # Skip YOLO while nothing moves inside the ROI. Sensitivity is the fraction of
+    # changed pixels that counts as motion; detection stays on for hold-off seconds after it.
+    "motion_gate": True,
+    "motion_sensitivity": 0.01,
+    "motion_pixel_threshold": 25,
+    "motion_hold_off": 2.0,
+    # Drop to governor_idle_fps after governor_idle_after seconds without motion or plates;
+    # governor_max_latency caps the idle frame interval (worst-case first-detection delay).
+    "governor": True,
+    "governor_idle_after": 10.0,
+    "governor_idle_fps": 2.0,
+    "governor_max_latency": 1.0,
+    # Plate detector: "auto" (CUDA if available, else ONNX Runtime on CPU), "cuda", "onnx" or
+    # "onnx-int8" (quantized model from `python detector.py --calibrate sample_video`).
+    # ONNX Runtime thread counts; 0 lets it choose.
+    "detector_backend": BACKEND_AUTO,
+    "onnx_intra_op_threads": 0,
+    "onnx_inter_op_threads": 0,
+    # Load the detector and OCR at launch (warm by the time login is done) instead of
+    # on the first video source. Off keeps history/export-only sessions free of them.
+    "preload_models": False,
+}
+
 # ------------------------------ Gate/ESP32 Serial Settings ------------------------------
 TARGET_PLATE = "HR26CQ6869"
 # Optional preferred COM port name hint. Leave empty to auto-detect by USB VID/PID matching typical CP210x/CH340/FTDI
@@ -36,6 +160,7 @@ def find_serial_port(preferred: str = PREFERRED_COM) -> Optional[str]:
     try:
         if preferred:
             return preferred
+        import serial.tools.list_ports
         ports = list(serial.tools.list_ports.comports())
         for p in ports:
             # Heuristic: pick first USB serial
@@ -61,6 +186,7 @@ class GateController:
         if not port:
             return False
         try:
+            import serial
             self.ser = serial.Serial(port, SERIAL_BAUD, timeout=SERIAL_TIMEOUT)
             # give ESP32 time to reset on serial open
             time.sleep(1.0)
@@ -151,13 +277,13 @@ QLineEdit, QComboBox, QDateEdit {{
     padding: 6px;
     color: #e0e6ef;
 }}
-QTableWidget {{
+QTableView {{
     background-color: #0f1117;
     gridline-color: #2a2f3a;
     selection-background-color: #2f4f84;
     selection-color: #ffffff;
 }}
-QTableWidget::item {{
+QTableView::item {{
     padding: 6px;
 }}
 QHeaderView::section {{
@@ -298,13 +424,13 @@ QLineEdit, QComboBox, QDateEdit {{
     padding: 6px;
     color: #0f172a;
 }}
-QTableWidget {{
+QTableView {{
     background-color: #ffffff;
     gridline-color: #cbd5e1;
     selection-background-color: #bfdbfe;
     selection-color: #0f172a;
 }}
-QTableWidget::item {{
+QTableView::item {{
     padding: 6px;
 }}
 QHeaderView::section {{
@@ -469,16 +595,57 @@ def create_app_icon() -> QIcon:
 ########################################################################
 # VideoLabel: Supports freeform polyline ROI selection.
 # Left-click to add a point; double-click to finish the polygon.
+# A finished ROI is kept normalised to the displayed video image, so it
+# stays on the same part of the picture when the window is resized.
 ########################################################################
 class VideoLabel(QLabel):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.roi_points = []      # List of QPoint
+        self.roi_points = []      # List of QPoint in label coordinates (as drawn)
+        self.roi_norm = None      # Finished ROI: tuple of (x, y) in 0..1 of the video image
+        self._roi_rect = None     # image rect roi_points were last placed for
         self.poly_finished = False
         self.editable = False     # When True, user can add/edit ROI
         self.setMouseTracking(True)
         self.setStyleSheet("border-radius: 12px;")
 
+    def image_rect(self):
+        """Where the (aspect-fitted, centred) video pixmap is drawn inside the label."""
+        pix = self.pixmap()
+        if pix is None or pix.isNull():
+            return self.rect()
+        return QRect((self.width() - pix.width()) // 2, (self.height() - pix.height()) // 2, pix.width(), pix.height())
+
+    def set_roi_norm(self, points):
+        self.roi_norm = tuple((float(x), float(y)) for x, y in points)
+        self.poly_finished = True
+        self._roi_rect = None
+        self.sync_roi_points()
+
+    def sync_roi_points(self):
+        """Re-place the finished ROI on the image after the label or the pixmap changed size."""
+        rect = self.image_rect()
+        if not (self.poly_finished and self.roi_norm) or rect == self._roi_rect:
+            return
+        self._roi_rect = rect
+        self.roi_points = [QPoint(rect.x() + int(x * rect.width()), rect.y() + int(y * rect.height()))
+                           for x, y in self.roi_norm]
+        self.update()
+
+    def setPixmap(self, pixmap):
+        super().setPixmap(pixmap)
+        self.sync_roi_points()
+
+    def finish_roi(self):
+        rect = self.image_rect()
+        w, h = max(1, rect.width()), max(1, rect.height())
+        self.set_roi_norm([(min(max((pt.x() - rect.x()) / w, 0.0), 1.0), min(max((pt.y() - rect.y()) / h, 0.0), 1.0))
+                           for pt in self.roi_points])
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.sync_roi_points()
+
     def mousePressEvent(self, event):
         if self.editable and event.button() == Qt.LeftButton:
             self.roi_points.append(event.pos())
@@ -489,14 +656,14 @@ class VideoLabel(QLabel):
     def mouseDoubleClickEvent(self, event):
         if self.editable:
             if len(self.roi_points) >= 3:  # Need at least 3 points to form a polygon.
-                self.poly_finished = True
+                self.finish_roi()
                 self.editable = False  # Stop further editing.
-                self.update()
         else:
             super().mouseDoubleClickEvent(event)
 
     def reset_roi(self):
         self.roi_points = []
+        self.roi_norm = None
         self.poly_finished = False
         self.update()
 
@@ -582,10 +749,8 @@ class SettingsDialog(QDialog):
             self.video_label.editable = False
 
     def save_roi(self):
-        if self.video_label and self.video_label.roi_points and self.video_label.poly_finished:
-            label_width = self.video_label.width()
-            label_height = self.video_label.height()
-            norm_points = [{"x": pt.x() / label_width, "y": pt.y() / label_height} for pt in self.video_label.roi_points]
+        if self.video_label and self.video_label.roi_norm and self.video_label.poly_finished:
+            norm_points = [{"x": x, "y": y} for x, y in self.video_label.roi_norm]
             try:
                 with open(ROI_SETTINGS_FILE, "w") as f:
                     json.dump(norm_points, f)
@@ -601,6 +766,10 @@ class SettingsDialog(QDialog):
 ########################################################################
 # DataViewDialog: Displays detection logs and supports CSV export.
 ########################################################################
+SEARCH_DEBOUNCE_MS = 250   # plate search waits for a pause in typing
+HISTORY_PAGE_ROWS = 1000   # rows handed to the history view per scroll page
+EXPORT_FILTERS = {"Excel Files (*.xlsx)": ".xlsx", "CSV Files (*.csv)": ".csv", "Parquet Files (*.parquet)": ".parquet"}
+
 class DataViewDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -613,7 +782,15 @@ class DataViewDialog(QDialog):
         
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Search by Plate Number...")
-        self.search_edit.textChanged.connect(self.filter_table)
+        # Debounced: the search runs once typing pauses, on the PlateSearch thread.
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_table)
+        self.search_edit.textChanged.connect(lambda _text: self.search_timer.start())
+        self.fuzzy_check = QCheckBox("Fuzzy")
+        self.fuzzy_check.setToolTip("Also match OCR look-alikes (O/0, I/1, B/8, ...) and plates one edit away")
+        self.fuzzy_check.toggled.connect(self.filter_table)
         
         self.start_date_edit = QDateEdit()
         self.start_date_edit.setCalendarPopup(True)
@@ -632,24 +809,44 @@ class DataViewDialog(QDialog):
         self.export_all_button.clicked.connect(self.export_all_csv)
         self.export_zip_button = QPushButton("Export All as ZIP")
         self.export_zip_button.clicked.connect(self.export_all_as_zip)
+        self.view_range_button = QPushButton("View All Listed")
+        self.view_range_button.setToolTip("Load every day file for the current filter mode into the table")
+        self.view_range_button.clicked.connect(self.view_range)
+        self.status_label = QLabel("")
+        # Merged export runs on a worker; progress and cancel stay in the dialog.
+        self.export_progress = QProgressBar()
+        self.export_progress.setRange(0, 100)
+        self.export_progress.setVisible(False)
+        self.cancel_export_button = QPushButton("Cancel Export")
+        self.cancel_export_button.setVisible(False)
+        self.cancel_export_button.clicked.connect(self.cancel_export)
         
         controls_layout = QGridLayout()
         controls_layout.addWidget(QLabel("Filter Mode:"), 0, 0)
         controls_layout.addWidget(self.filter_mode_combo, 0, 1)
         controls_layout.addWidget(QLabel("Plate Search:"), 1, 0)
-        controls_layout.addWidget(self.search_edit, 1, 1)
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(self.search_edit)
+        search_layout.addWidget(self.fuzzy_check)
+        controls_layout.addLayout(search_layout, 1, 1)
         controls_layout.addWidget(QLabel("Start Date:"), 2, 0)
         controls_layout.addWidget(self.start_date_edit, 2, 1)
         controls_layout.addWidget(QLabel("End Date:"), 3, 0)
         controls_layout.addWidget(self.end_date_edit, 3, 1)
         controls_layout.addWidget(self.export_selected_button, 4, 0)
         controls_layout.addWidget(self.export_all_button, 4, 1)
-        controls_layout.addWidget(self.export_zip_button, 5, 0, 1, 2)
+        controls_layout.addWidget(self.view_range_button, 5, 0)
+        controls_layout.addWidget(self.export_zip_button, 5, 1)
+        controls_layout.addWidget(self.status_label, 6, 0, 1, 2)
+        controls_layout.addWidget(self.export_progress, 7, 0)
+        controls_layout.addWidget(self.cancel_export_button, 7, 1)
         
-        self.table_data = QTableWidget()
-        self.table_data.setColumnCount(5)
-        self.table_data.setHorizontalHeaderLabels(["Timestamp", "Plate ID", "Plate Number", "OCR Conf", "Plate Conf"])
+        # The view asks the model for visible rows only; data, sort and search stay in NumPy arrays.
+        self.history_model = ColumnTableModel(HISTORY_COLUMNS, self, page_size=HISTORY_PAGE_ROWS)
+        self.table_data = QTableView()
+        self.table_data.setModel(self.history_model)
         self.table_data.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_data.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         # Table UX improvements
         self.table_data.setAlternatingRowColors(True)
         self.table_data.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -679,7 +876,16 @@ class DataViewDialog(QDialog):
         main_layout.addWidget(splitter)
         self.setLayout(main_layout)
         
-        self.data = pd.DataFrame()
+        self.history_loader = None
+        self.history_timer = QTimer(self)
+        self.history_timer.timeout.connect(self.check_history)
+        self.plate_search = PlateSearch()
+        self.search_serial = 0
+        self.search_poll = QTimer(self)
+        self.search_poll.timeout.connect(self.check_search)
+        self.export_job = None
+        self.export_timer = QTimer(self)
+        self.export_timer.timeout.connect(self.check_export)
         self.load_csv_list()
 
     def filter_mode_changed(self, text):
@@ -715,53 +921,18 @@ class DataViewDialog(QDialog):
         else:
             self.list_files.addItem("No CSV files found")
 
-    def load_csv_data(self, item):
-        file_path = item.data(Qt.UserRole)
-        if not file_path:
-            file_path = item.text()
-        try:
-            self.data = pd.read_csv(file_path)
-            self.populate_table(self.data)
-        except Exception as e:
-            QMessageBox.warning(self, "Data View", f"Error loading CSV: {e}")
-
-    def populate_table(self, df):
-        self.table_data.clearContents()
-        self.table_data.setRowCount(len(df))
-        for row in range(len(df)):
-            for col in range(len(df.columns)):
-                item = QTableWidgetItem(str(df.iat[row, col]))
-                self.table_data.setItem(row, col, item)
-
-    def filter_table(self, text):
-        if not self.data.empty:
-            filtered = self.data[self.data["Plate Number"].str.contains(text, case=False, na=False)]
-            self.populate_table(filtered)
-
-    def export_to_excel(self):
-        if not self.data.empty:
-            save_path, _ = QFileDialog.getSaveFileName(self, "Export Selected CSV to Excel", "", "Excel Files (*.xlsx)")
-            if save_path:
-                try:
-                    self.data.to_excel(save_path, index=False)
-                    QMessageBox.information(self, "Export", "Data exported successfully.")
-                except Exception as e:
-                    QMessageBox.warning(self, "Export", f"Error exporting data: {e}")
-        else:
-            QMessageBox.warning(self, "Export", "No data to export.")
-
-    def export_all_csv(self):
+    def selected_files(self):
+        """Day files for the current filter mode, in date order."""
+        files = glob.glob(os.path.join(DATA_LOG_DIR, "detections_*.csv"))
         mode = self.filter_mode_combo.currentText()
-        if mode == "Entire":
-            selected_files = glob.glob(os.path.join(DATA_LOG_DIR, "detections_*.csv"))
-        elif mode == "Today":
+        if mode == "Today":
             today_str = datetime.now().strftime("%Y-%m-%d")
-            selected_files = [f for f in glob.glob(os.path.join(DATA_LOG_DIR, "detections_*.csv")) if today_str in f]
+            files = [f for f in files if today_str in f]
         elif mode == "Date Range":
             start_date = self.start_date_edit.date().toPython()
             end_date = self.end_date_edit.date().toPython()
             selected_files = []
-            for f in glob.glob(os.path.join(DATA_LOG_DIR, "detections_*.csv")):
+            for f in files:
                 try:
                     basename = os.path.basename(f)
                     date_str = basename.replace("detections_", "").replace(".csv", "")
@@ -770,44 +941,146 @@ class DataViewDialog(QDialog):
                         selected_files.append(f)
                 except Exception as e:
                     print(f"Error processing file {f}: {e}")
-        merged_df = pd.DataFrame()
-        for f in selected_files:
-            try:
-                df = pd.read_csv(f)
-                merged_df = pd.concat([merged_df, df], ignore_index=True)
-            except Exception as e:
-                print(f"Error processing file {f}: {e}")
-        if not merged_df.empty:
-            save_path, _ = QFileDialog.getSaveFileName(self, "Export Merged Data to Excel", "", "Excel Files (*.xlsx)")
+            files = selected_files
+        return sorted(files)
+
+    def load_csv_data(self, item):
+        file_path = item.data(Qt.UserRole)
+        if not file_path:
+            file_path = item.text()
+        self.load_history([file_path])
+
+    def view_range(self):
+        files = self.selected_files()
+        if files:
+            self.load_history(files)
+        else:
+            QMessageBox.warning(self, "Data View", "No CSV files found for the selected filter.")
+
+    def load_history(self, paths):
+        """Read the day files on a worker thread; check_history shows them when done."""
+        if self.history_loader is not None:
+            self.history_loader.cancel()
+        self.history_loader = HistoryLoader(paths).start()
+        self.status_label.setText(f"Loading {len(paths)} file(s)...")
+        self.history_timer.start(50)
+
+    def check_history(self):
+        loader = self.history_loader
+        state = loader.state()
+        if state == LOG_LOADING:
+            self.status_label.setText(f"Loading {loader.files_done}/{len(loader.paths)} file(s), {loader.rows:,} rows...")
+            return
+        self.history_timer.stop()
+        self.history_loader = None
+        if state != LOG_READY:
+            self.status_label.setText("")
+            QMessageBox.warning(self, "Data View", f"Error loading CSV: {loader.error}")
+            return
+        self.history_model.set_columns([loader.result[name] for name in CSV_COLUMNS])
+        self.plate_search.set_plates(loader.result["Plate Number"])
+        self.filter_table()
+        status = f"{loader.rows:,} rows from {len(loader.paths) - len(loader.failed)} file(s) in {loader.seconds:.2f}s"
+        if loader.failed:
+            status += "; skipped " + "; ".join(f"{os.path.basename(path)}: {e}" for path, e in loader.failed)
+        self.status_label.setText(status)
+        if loader.failed:
+            QMessageBox.warning(self, "Data View", "Error loading CSV: " + "; ".join(
+                f"{os.path.basename(path)}: {e}" for path, e in loader.failed))
+
+    def filter_table(self):
+        self.search_timer.stop()
+        text = self.search_edit.text().strip()
+        if not text:
+            self.search_serial = 0  # ignore a query still running
+            self.search_poll.stop()
+            self.history_model.set_filter(None)
+            return
+        self.search_serial = self.plate_search.submit(text, self.fuzzy_check.isChecked())
+        self.search_poll.start(30)
+
+    def check_search(self):
+        # Poll until the latest query has an answer from a finished index, then stop until the next submit.
+        if self.plate_search.building():
+            self.status_label.setText("Indexing plates...")
+            return
+        result = self.plate_search.result()
+        if result is None or result[0] != self.search_serial:
+            return
+        self.search_poll.stop()
+        _, rows, seconds = result
+        self.history_model.set_filter(rows)
+        self.status_label.setText(f"{len(rows):,} of {self.history_model.column_values(0).size:,} rows match "
+                                  f"'{self.search_edit.text().strip()}' ({1000 * seconds:.0f} ms)")
+
+    def history_frame(self) -> pd.DataFrame:
+        """Everything loaded into the table (unfiltered), with the CSV column names."""
+        columns = {name: self.history_model.column_values(i) for i, name in enumerate(CSV_COLUMNS)}
+        return pd.DataFrame(dict(zip(CSV_COLUMNS, cell_columns(columns))))
+
+    def export_to_excel(self):
+        if self.history_model.column_values(0).size:
+            save_path, _ = QFileDialog.getSaveFileName(self, "Export Selected CSV to Excel", "", "Excel Files (*.xlsx)")
             if save_path:
                 try:
-                    merged_df.to_excel(save_path, index=False)
-                    QMessageBox.information(self, "Export", "Merged data exported successfully.")
+                    self.history_frame().to_excel(save_path, index=False)
+                    QMessageBox.information(self, "Export", "Data exported successfully.")
                 except Exception as e:
-                    QMessageBox.warning(self, "Export", f"Error exporting merged data: {e}")
+                    QMessageBox.warning(self, "Export", f"Error exporting data: {e}")
         else:
+            QMessageBox.warning(self, "Export", "No data to export.")
+
+    def export_all_csv(self):
+        """Merge the day files for the current filter into one XLSX, CSV or Parquet file, in the background."""
+        if self.export_job is not None:
+            return
+        selected_files = self.selected_files()
+        if not selected_files:
             QMessageBox.warning(self, "Export", "No data found for the selected filter.")
+            return
+        save_path, chosen = QFileDialog.getSaveFileName(self, "Export Merged Data", "", ";;".join(EXPORT_FILTERS))
+        if not save_path:
+            return
+        if not os.path.splitext(save_path)[1]:
+            save_path += EXPORT_FILTERS.get(chosen, ".xlsx")
+        self.export_job = MergedExport(selected_files, save_path).start()
+        self.export_all_button.setEnabled(False)
+        self.export_progress.setValue(0)
+        self.export_progress.setFormat(f"Exporting 0/{len(selected_files)} file(s)")
+        self.export_progress.setVisible(True)
+        self.cancel_export_button.setVisible(True)
+        self.export_timer.start(100)
+
+    def cancel_export(self):
+        if self.export_job is not None:
+            self.export_job.cancel()
+            self.cancel_export_button.setEnabled(False)
+
+    def check_export(self):
+        job = self.export_job
+        state = job.state()
+        self.export_progress.setValue(int(100 * job.progress()))
+        self.export_progress.setFormat(f"Exporting {job.files_done}/{len(job.paths)} file(s), {job.rows:,} rows")
+        if state == EXPORT_RUNNING:
+            return
+        self.export_timer.stop()
+        self.export_job = None
+        self.export_all_button.setEnabled(True)
+        self.export_progress.setVisible(False)
+        self.cancel_export_button.setVisible(False)
+        self.cancel_export_button.setEnabled(True)
+        if state == EXPORT_DONE:
+            message = f"Merged data exported successfully: {job.rows:,} rows from {len(job.paths)} file(s)."
+            if job.failed:
+                message += "\nSkipped: " + "; ".join(f"{os.path.basename(path)}: {e}" for path, e in job.failed)
+            QMessageBox.information(self, "Export", message)
+        elif state == EXPORT_CANCELLED:
+            self.status_label.setText("Export cancelled.")
+        else:
+            QMessageBox.warning(self, "Export", f"Error exporting merged data: {job.error}")
 
     def export_all_as_zip(self):
-        mode = self.filter_mode_combo.currentText()
-        if mode == "Entire":
-            selected_files = glob.glob(os.path.join(DATA_LOG_DIR, "detections_*.csv"))
-        elif mode == "Today":
-            today_str = datetime.now().strftime("%Y-%m-%d")
-            selected_files = [f for f in glob.glob(os.path.join(DATA_LOG_DIR, "detections_*.csv")) if today_str in f]
-        elif mode == "Date Range":
-            start_date = self.start_date_edit.date().toPython()
-            end_date = self.end_date_edit.date().toPython()
-            selected_files = []
-            for f in glob.glob(os.path.join(DATA_LOG_DIR, "detections_*.csv")):
-                try:
-                    basename = os.path.basename(f)
-                    date_str = basename.replace("detections_", "").replace(".csv", "")
-                    file_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                    if start_date <= file_date <= end_date:
-                        selected_files.append(f)
-                except Exception as e:
-                    print(f"Error processing file {f}: {e}")
+        selected_files = self.selected_files()
         if selected_files:
             save_path, _ = QFileDialog.getSaveFileName(self, "Export CSV Files as ZIP", "", "Zip Files (*.zip)")
             if save_path:
@@ -821,6 +1094,52 @@ class DataViewDialog(QDialog):
         else:
             QMessageBox.warning(self, "Export", "No CSV files found for the selected filter.")
 
+    def done(self, result):
+        self.history_timer.stop()
+        self.search_timer.stop()
+        self.search_poll.stop()
+        if self.history_loader is not None:
+            self.history_loader.cancel()
+        self.plate_search.close()
+        # An unfinished export is cancelled (and its partial file removed) with the dialog.
+        self.export_timer.stop()
+        if self.export_job is not None:
+            self.export_job.cancel()
+        super().done(result)
+
+def read_app_settings() -> dict:
+    """DEFAULT_SETTINGS overlaid with settings.json, with unknown enum values replaced by their defaults."""
+    settings = dict(DEFAULT_SETTINGS)
+    if os.path.exists(SETTINGS_FILE):
+        try:
+            with open(SETTINGS_FILE, "r") as f:
+                settings.update(json.load(f))
+        except Exception as e:
+            print(f"Error loading settings: {e}")
+    if settings["detector_backend"] not in BACKENDS:
+        print(f"Unknown detector_backend '{settings['detector_backend']}', using {BACKEND_AUTO}")
+        settings["detector_backend"] = BACKEND_AUTO
+    if settings["pipeline_drop_policy"] not in DROP_POLICIES:
+        print(f"Unknown pipeline_drop_policy '{settings['pipeline_drop_policy']}', using {DROP_OLDEST}")
+        settings["pipeline_drop_policy"] = DROP_OLDEST
+    for key in ("ocr_preprocess", "ocr_fast_preprocess"):
+        try:
+            PreprocessChain(settings[key])
+        except Exception as e:
+            print(f"Invalid {key}: {e}; using {DEFAULT_SETTINGS[key]}")
+            settings[key] = DEFAULT_SETTINGS[key]
+    return settings
+
+
+def create_model_loader(settings: dict) -> ModelLoader:
+    """Start loading the detector and OCR in the background (see model_loader.py)."""
+    return ModelLoader(MODEL_PATH, settings["detector_backend"],
+                       int(settings["onnx_intra_op_threads"]), int(settings["onnx_inter_op_threads"]),
+                       int(settings["ocr_workers"]), int(settings["ocr_threads_per_worker"]),
+                       max(1, int(settings["ocr_max_batch"])), settings["ocr_preprocess"],
+                       settings["ocr_fast_preprocess"]).start()
+
+
 ########################################################################
 # LoginDialog: Shown before main window to authenticate user
 ########################################################################
@@ -891,14 +1210,14 @@ class LoginDialog(QDialog):
 # This version integrates a fixed polygon area check for OCR processing.
 ########################################################################
 class MainWindow(QMainWindow):
-    def __init__(self, username: str = "User"):
+    def __init__(self, username: str = "User", model_loader: ModelLoader = None):
         super().__init__()
         self.setWindowTitle("ANPR_DR")
         self.setWindowIcon(create_app_icon())
         self.setMinimumSize(1200, 800)
         
         # Define a fixed area (from your reference) if no ROI is set.
-        self.fixed_area = [(27, 417), (16, 456), (1015, 451), (992, 417)]
+        self.fixed_area = ((27, 417), (16, 456), (1015, 451), (992, 417))
         self.current_user = username
         
         # Top header with app name and Reload button.
@@ -943,11 +1262,13 @@ class MainWindow(QMainWindow):
         apply_drop_shadow(left_widget)
         
         # Right Panel: Detection Log and Reset Data button.
-        self.table_detections = QTableWidget()
-        self.table_detections.setColumnCount(5)
-        self.table_detections.setHorizontalHeaderLabels(
-            ["Plate ID", "Plate Number", "OCR Confidence", "Plate Confidence", "Timestamp"]
-        )
+        # Model/view: rows live in a columnar store and the bars are painted by a delegate,
+        # so a day's worth of detections does not create a widget per cell.
+        self.detections_model = ColumnTableModel(DETECTION_COLUMNS, self)
+        self.table_detections = QTableView()
+        self.table_detections.setModel(self.detections_model)
+        self.table_detections.setItemDelegateForColumn(2, ConfidenceBarDelegate(OCR_BAR_COLOR, self.table_detections))
+        self.table_detections.setItemDelegateForColumn(3, ConfidenceBarDelegate(PLATE_BAR_COLOR, self.table_detections))
         self.table_detections.setMinimumSize(500, 600)
         # Table UX improvements
         self.table_detections.setAlternatingRowColors(True)
@@ -955,8 +1276,10 @@ class MainWindow(QMainWindow):
         self.table_detections.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table_detections.setSortingEnabled(True)
         self.table_detections.setWordWrap(False)
-        self.table_detections.setStyleSheet("QTableWidget::item{padding:6px;}")
+        self.table_detections.setStyleSheet("QTableView::item{padding:6px;}")
         self.table_detections.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Fixed row height: the view never measures rows, which keeps scrolling cheap at 100k rows.
+        self.table_detections.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.table_detections.verticalHeader().setDefaultSectionSize(28)
         
         self.reset_button = QPushButton("Reset Data")
@@ -1054,6 +1377,8 @@ class MainWindow(QMainWindow):
         toolbar.addAction(act_reload)
         toolbar.addSeparator()
         toolbar.addAction(self.act_theme)
+        # Video sources stay disabled until the models have loaded.
+        self.source_controls = [self.btn_web, self.btn_upload, self.reload_button, act_webcam, act_open_video, act_reload]
         
         # Status bar with FPS and detection count
         status = QStatusBar()
@@ -1069,7 +1394,29 @@ class MainWindow(QMainWindow):
         status.addPermanentWidget(self.user_label)
         status.addPermanentWidget(self.mode_label)
         status.addPermanentWidget(self.fps_label)
+        self.governor_label = QLabel("Rate: -")
+        self.governor_label.setObjectName("BadgeInfo")
+        self.governor_label.setToolTip("Frame-rate governor: Active processes every frame, Idle throttles a quiet lane")
+        status.addPermanentWidget(self.governor_label)
         status.addPermanentWidget(self.count_label)
+        self.queue_label = QLabel("Queues: -")
+        self.queue_label.setObjectName("BadgeInfo")
+        status.addPermanentWidget(self.queue_label)
+        self.motion_label = QLabel("Motion: -")
+        self.motion_label.setObjectName("BadgeInfo")
+        self.motion_label.setToolTip("Frames skipped by the motion gate / frames checked")
+        status.addPermanentWidget(self.motion_label)
+        self.ocr_label = QLabel("OCR: -")
+        self.ocr_label.setObjectName("BadgeInfo")
+        self.ocr_label.setToolTip("Which OCR pass decided each reading: fast (cheap first pass) / rec (heavy "
+                                  "preprocessing) / det+rec / rec>det+rec (fallback) / cache (near-identical crop) / "
+                                  "empty (empty crop); "
+                                  "skipped = not due per tracker; hits = OCR cache hit rate")
+        status.addPermanentWidget(self.ocr_label)
+        self.models_label = QLabel("Models: Loading")
+        self.models_label.setObjectName("BadgeInfo")
+        self.models_label.setToolTip("Plate detector and OCR load in the background; video sources unlock when ready")
+        status.addPermanentWidget(self.models_label)
         
         # Pause/Resume button for video control
         self.btn_pause = QPushButton("Pause")
@@ -1085,30 +1432,46 @@ class MainWindow(QMainWindow):
         # Initialize Video Capture, Timer, Models, and Settings.
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
-        self.cap = None
-        
-        # Load YOLO model and PaddleOCR.
-        self.model = YOLO(r"D:\peer\kvcet_vehicle\model\best.pt")
-        try:
-            import torch
-            if not torch.cuda.is_available():
-                QMessageBox.critical(self, "GPU Required", "CUDA GPU not available. Plate detection (YOLO) requires a CUDA GPU. PaddleOCR will run on CPU.")
-                self.gpu_ready = False
-            else:
-                self.model.to('cuda:0')
-                self.gpu_ready = True
-        except Exception as e:
-            QMessageBox.critical(self, "GPU Error", f"Failed to initialize CUDA: {e}")
-            self.gpu_ready = False
+        self.grabber = None
+        self.pipeline = None
+        self.roi_snapshot = None
+        self.roi_cache = RoiCache()  # frame-space ROI geometry, rebuilt when the ROI or frame size changes
+        self._last_frame_seq = 0
+        self._last_shown_seq = 0
+        self.stale_frames = 0
+        self.ocr_path_counts = Counter()  # OCR path -> plates read that way; written by the OCR stage
+        self.ocr_path_lock = threading.Lock()
         
-        # Force PaddleOCR to CPU only
-        self.ocr_reader = PaddleOCR(use_angle_cls=True, lang="en", show_log=False, rec_algorithm="SVTR_LCNet", use_gpu=False)
         self.load_app_settings()
+        # The plate detector (CUDA, or ONNX Runtime on CPU when there is no GPU) and PaddleOCR
+        # load on a background thread; check_models() picks them up once they are warm.
+        self.detector = None
+        self.ocr_pool = None
+        self.ocr_reader = None
+        self.model_loader = model_loader
+        self.pending_source = None  # (source, mode) to start once the models are ready
+        self.model_timer = QTimer()
+        self.model_timer.timeout.connect(self.check_models)
+        self.history_loader = None  # today's CSV, parsed in the background (see load_existing_detection_data)
+        self.history_timer = QTimer()
+        self.history_timer.timeout.connect(self.check_history)
+        if self.model_loader is None and self.app_settings["preload_models"]:
+            self.model_loader = create_model_loader(self.app_settings)
+        if self.model_loader is not None:
+            self.ensure_models()
+        else:
+            self.models_label.setText("Models: On demand")
         
-        self.last_detection_times = {}  # plate_text -> datetime
-        self.last_detection_ids = {}      # plate_text -> detection id
+        self.detection_lock = threading.Lock()
         self.detection_interval = 60      # seconds
-        self.plate_id_counter = 0
+        # Plates logged within detection_interval; seeded from today's CSV in check_history.
+        self.recent_plates = DedupStore(self.detection_interval, int(self.app_settings["dedup_max_plates"]),
+                                        int(self.app_settings["dedup_max_distance"]))
+        # Track IDs double as Plate IDs; numbering continues after today's CSV (see check_history).
+        self.tracker = PlateTracker(**self.tracker_settings)
+        self.motion_gate = MotionGate(**self.motion_settings) if self.motion_enabled else None
+        self.governor = FrameRateGovernor(**self.governor_settings) if self.governor_enabled else None
+        self.ocr_cache = OcrCache(**self.ocr_cache_settings) if self.ocr_cache_enabled else None
         
         # FPS tracking
         self._last_time = None
@@ -1171,61 +1534,49 @@ class MainWindow(QMainWindow):
             pass
 
     def load_existing_detection_data(self):
+        """Parse today's CSV on a worker thread; check_history fills the log when it is done."""
         date_str = datetime.now().strftime("%Y-%m-%d")
         filename = os.path.join(DATA_LOG_DIR, f"detections_{date_str}.csv")
-        if os.path.exists(filename):
-            try:
-                df = pd.read_csv(filename)
-                for _, r in df.iterrows():
-                    row = self.table_detections.rowCount()
-                    self.table_detections.insertRow(row)
-                    self.table_detections.setItem(row, 0, QTableWidgetItem(str(r["Plate ID"])))
-                    self.table_detections.setItem(row, 1, QTableWidgetItem(str(r["Plate Number"])) )
-                    # OCR
-                    try:
-                        ocr_val = float(r["OCR Confidence"]) if pd.notna(r["OCR Confidence"]) else 0.0
-                    except Exception:
-                        ocr_val = 0.0
-                    ocr_bar = QProgressBar()
-                    ocr_bar.setRange(0, 100)
-                    ocr_bar.setValue(int(round(ocr_val * 100)))
-                    ocr_bar.setFormat(f"{ocr_val:.2f}")
-                    ocr_bar.setTextVisible(True)
-                    ocr_bar.setStyleSheet("QProgressBar::chunk{background-color:#3b82f6;border-radius:6px;} QProgressBar{border-radius:6px;}")
-                    self.table_detections.setCellWidget(row, 2, ocr_bar)
-                    # Plate
-                    try:
-                        plate_val = float(r["Plate Confidence"]) if pd.notna(r["Plate Confidence"]) else 0.0
-                    except Exception:
-                        plate_val = 0.0
-                    plate_bar = QProgressBar()
-                    plate_bar.setRange(0, 100)
-                    plate_bar.setValue(int(round(plate_val * 100)))
-                    plate_bar.setFormat(f"{plate_val:.2f}")
-                    plate_bar.setTextVisible(True)
-                    plate_bar.setStyleSheet("QProgressBar::chunk{background-color:#10b981;border-radius:6px;} QProgressBar{border-radius:6px;}")
-                    self.table_detections.setCellWidget(row, 3, plate_bar)
-                    self.table_detections.setItem(row, 4, QTableWidgetItem(str(r["Timestamp"])))
-                self.count_label.setText(f"Detections: {self.table_detections.rowCount()}")
-            except Exception as e:
-                print("Error loading detection data:", e)
+        if not os.path.exists(filename):
+            return
+        try:
+            self.history_loader = DetectionLogLoader(filename, self.detection_interval).start()
+        except Exception as e:
+            print("Error loading detection data:", e)
+            return
+        self.count_label.setText("Detections: loading")
+        self.history_timer.start(50)
 
-    def reload_app(self):
-        if self.cap is not None:
-            self.cap.release()
-        if not getattr(self, "gpu_ready", False):
-            QMessageBox.critical(self, "GPU Required", "CUDA GPU not available. Cannot start detection.")
+    def check_history(self):
+        loader = self.history_loader
+        if loader is None:
+            self.history_timer.stop()
             return
-        self.cap = cv2.VideoCapture(0)
-        self.apply_saved_roi()
-        self._last_time = None
-        self._fps = 0.0
-        self.mode_label.setText("Mode: Webcam")
-        self.current_mode = "Webcam"
-        self.is_paused = False
-        self.btn_pause.setEnabled(True)
-        self.btn_pause.setText("Pause")
-        self.timer.start(30)
+        state = loader.state()
+        if state == LOG_LOADING:
+            if loader.rows is not None:
+                self.count_label.setText(f"Detections: loading {loader.rows:,} rows")
+            return
+        self.history_timer.stop()
+        self.history_loader = None
+        if state == LOG_READY:
+            log = loader.result
+            self.detections_model.set_columns(log["columns"])
+            if log["last_id"] is not None:
+                self.tracker.seed_next_id(log["last_id"])
+            # Plates already logged in the last detection_interval are not logged again after a restart.
+            self.recent_plates.seed(log["recent"])
+            print(f"[History] {loader.rows:,} detections loaded in {loader.seconds:.2f}s")
+        else:
+            print("Error loading detection data:", loader.error)
+        self.count_label.setText(f"Detections: {self.detections_model.rowCount()}")
+        if self.pending_source is not None:
+            source, mode = self.pending_source
+            self.pending_source = None
+            self.start_capture(source, mode)
+
+    def reload_app(self):
+        self.start_capture(0, "Webcam")
         
     def open_settings_dialog(self):
         dlg = SettingsDialog(
@@ -1238,13 +1589,11 @@ class MainWindow(QMainWindow):
             new_plate, new_ocr = dlg.get_thresholds()
             self.plate_conf_threshold = new_plate
             self.ocr_conf_threshold = new_ocr
-            settings = {
-                "plate_confidence_threshold": self.plate_conf_threshold,
-                "ocr_confidence_threshold": self.ocr_conf_threshold
-            }
+            self.app_settings["plate_confidence_threshold"] = self.plate_conf_threshold
+            self.app_settings["ocr_confidence_threshold"] = self.ocr_conf_threshold
             try:
                 with open(SETTINGS_FILE, "w") as f:
-                    json.dump(settings, f)
+                    json.dump(self.app_settings, f)
             except Exception as e:
                 QMessageBox.warning(self, "Settings", f"Error saving settings: {e}")
         
@@ -1253,76 +1602,175 @@ class MainWindow(QMainWindow):
         self.data_view_dialog.show()
         
     def load_app_settings(self):
-        default_settings = {"plate_confidence_threshold": 0.4, "ocr_confidence_threshold": 0.4}
-        if os.path.exists(SETTINGS_FILE):
-            try:
-                with open(SETTINGS_FILE, "r") as f:
-                    settings = json.load(f)
-            except Exception as e:
-                print(f"Error loading settings: {e}")
-                settings = default_settings
-        else:
-            settings = default_settings
-        self.plate_conf_threshold = settings.get("plate_confidence_threshold", 0.4)
-        self.ocr_conf_threshold = settings.get("ocr_confidence_threshold", 0.4)
+        settings = read_app_settings()
+        # Kept whole so saving thresholds does not drop the other keys.
+        self.app_settings = settings
+        self.plate_conf_threshold = settings["plate_confidence_threshold"]
+        self.ocr_conf_threshold = settings["ocr_confidence_threshold"]
+        self.queue_size = int(settings["pipeline_queue_size"])
+        self.drop_policy = settings["pipeline_drop_policy"]
+        self.ocr_workers = int(settings["ocr_workers"])
+        self.ocr_threads_per_worker = int(settings["ocr_threads_per_worker"])
+        self.ocr_rec_only = bool(settings["ocr_rec_only"])
+        self.ocr_batch = bool(settings["ocr_batch"])
+        self.ocr_two_pass = bool(settings["ocr_two_pass"])
+        self.ocr_plate_pattern = settings["ocr_plate_pattern"] or ""
+        self.ocr_cache_enabled = bool(settings["ocr_cache"])
+        self.ocr_cache_settings = dict(
+            max_size=int(settings["ocr_cache_size"]),
+            ttl=float(settings["ocr_cache_ttl"]),
+            max_distance=int(settings["ocr_cache_max_distance"]),
+        )
+        self.ocr_batch_window = max(0, int(settings["ocr_batch_window_ms"])) / 1000.0
+        self.ocr_max_batch = max(1, int(settings["ocr_max_batch"]))
+        self.detector_backend = settings["detector_backend"]
+        self.onnx_intra_op_threads = int(settings["onnx_intra_op_threads"])
+        self.onnx_inter_op_threads = int(settings["onnx_inter_op_threads"])
+        self.tracker_settings = dict(
+            iou_threshold=float(settings["tracker_iou_threshold"]),
+            max_age=float(settings["tracker_max_age"]),
+            ocr_interval=float(settings["ocr_track_interval"]),
+            max_ocr_per_track=int(settings["ocr_max_per_track"]),
+            consensus_margin=float(settings["ocr_consensus_margin"]),
+        )
+        self.motion_enabled = bool(settings["motion_gate"])
+        self.motion_settings = dict(
+            sensitivity=float(settings["motion_sensitivity"]),
+            pixel_threshold=int(settings["motion_pixel_threshold"]),
+            hold_off=float(settings["motion_hold_off"]),
+        )
+        self.governor_enabled = bool(settings["governor"])
+        self.governor_settings = dict(
+            idle_after=float(settings["governor_idle_after"]),
+            idle_fps=float(settings["governor_idle_fps"]),
+            max_latency=float(settings["governor_max_latency"]),
+        )
         
+    def set_sources_enabled(self, enabled: bool):
+        for control in self.source_controls:
+            control.setEnabled(enabled)
+
+    def ensure_models(self):
+        """Start loading the detector and OCR unless already started; sources unlock when ready."""
+        if self.model_loader is None:
+            self.model_loader = create_model_loader(self.app_settings)
+        self._models_started = time.monotonic()
+        self.set_sources_enabled(False)
+        self.model_timer.start(200)
+
+    def check_models(self):
+        state = self.model_loader.state()
+        if state == LOADING:
+            self.models_label.setText(f"Models: Loading {time.monotonic() - self._models_started:.0f}s")
+            return
+        self.model_timer.stop()
+        if state == READY:
+            self.detector = self.model_loader.detector
+            self.ocr_pool = self.model_loader.ocr_pool
+            self.ocr_reader = self.model_loader.ocr_reader
+            self.models_label.setText("Models: Ready")
+            self.models_label.setToolTip("Load times: " + ", ".join(
+                f"{step} {secs:.1f}s" for step, secs in self.model_loader.timings.items()))
+            self.statusBar().showMessage(f"Plate detector: {self.detector.name}", 10000)
+            self.set_sources_enabled(True)
+            if self.pending_source is not None:
+                source, mode = self.pending_source
+                self.pending_source = None
+                self.start_capture(source, mode)
+        else:
+            self.pending_source = None
+            error = self.model_loader.error
+            # Let the operator retry: the next start_capture() loads the models again.
+            self.model_loader = None
+            self.set_sources_enabled(True)
+            self.models_label.setText("Models: Failed")
+            QMessageBox.critical(self, "Detector Error", f"Failed to load the models: {error}")
+
     def apply_saved_roi(self):
         if os.path.exists(ROI_SETTINGS_FILE):
             try:
                 with open(ROI_SETTINGS_FILE, "r") as f:
                     roi_data = json.load(f)
                 if isinstance(roi_data, list):
-                    label_width = self.video_label.width()
-                    label_height = self.video_label.height()
-                    self.video_label.roi_points = [QPoint(int(pt["x"] * label_width), int(pt["y"] * label_height)) for pt in roi_data]
-                    self.video_label.poly_finished = True
+                    self.video_label.set_roi_norm([(pt["x"], pt["y"]) for pt in roi_data])
                 self.video_label.editable = False
             except Exception as e:
                 print(f"Error applying saved ROI: {e}")
                 
     def start_webcam(self):
-        if self.cap is not None:
-            self.cap.release()
-        if not getattr(self, "gpu_ready", False):
-            QMessageBox.critical(self, "GPU Required", "CUDA GPU not available. Cannot start detection.")
+        self.start_capture(0, "Webcam")
+        
+    def upload_video(self):
+        file_name, _ = QFileDialog.getOpenFileName(self, "Open Video File", "", "Video Files (*.mp4 *.avi *.mov)")
+        if file_name:
+            self.start_capture(file_name, "File")
+
+    def start_capture(self, source, mode):
+        # Frames are grabbed on a background thread; the timer only consumes the newest one.
+        if self.history_loader is not None:
+            # Plate IDs and the duplicate filter continue from today's CSV; start once it is in.
+            self.pending_source = (source, mode)
+            self.statusBar().showMessage("Loading today's detections; the video starts when they are in.")
+            return
+        if self.model_loader is None or self.model_loader.state() == LOADING:
+            # First video source of the session: load the engine now and start once it is ready.
+            self.pending_source = (source, mode)
+            self.ensure_models()
+            self.statusBar().showMessage("Loading the detector and OCR models; the video starts when they are ready.")
+            return
+        self.stop_capture()
+        if self.detector is None:
+            QMessageBox.critical(self, "Detector Error", "Plate detector not available. Cannot start detection.")
             return
-        self.cap = cv2.VideoCapture(0)
+        self.grabber = FrameGrabber(source)
+        if not self.grabber.start():
+            QMessageBox.warning(self, "Video", f"Unable to open video source: {source}")
+            self.stop_capture()
+            return
+        self._last_frame_seq = 0
+        self._last_shown_seq = 0
+        self.stale_frames = 0
         self.apply_saved_roi()
+        self.roi_snapshot = self.current_roi_snapshot()
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
+        if self.governor is not None:
+            self.governor.reset()
+        if self.ocr_cache is not None:
+            self.ocr_cache.clear()
+        self.pipeline = (Pipeline()
+                         .add_source("capture", self.capture_stage)
+                         .add_stage("detect", self.detect_stage, self.queue_size, self.drop_policy)
+                         .add_stage("ocr", self.ocr_stage, self.queue_size, self.drop_policy,
+                                    max_batch=self.ocr_max_batch, batch_window=self.ocr_batch_window)
+                         .add_stage("sink", self.sink_stage, self.queue_size, self.drop_policy))
+        self.pipeline.start()
         self._last_time = None
         self._fps = 0.0
-        self.mode_label.setText("Mode: Webcam")
-        self.current_mode = "Webcam"
+        self.mode_label.setText(f"Mode: {mode}")
+        self.current_mode = mode
         self.is_paused = False
         self.btn_pause.setEnabled(True)
         self.btn_pause.setText("Pause")
         self.timer.start(30)
-        
-    def upload_video(self):
-        file_name, _ = QFileDialog.getOpenFileName(self, "Open Video File", "", "Video Files (*.mp4 *.avi *.mov)")
-        if file_name:
-            if self.cap is not None:
-                self.cap.release()
-            if not getattr(self, "gpu_ready", False):
-                QMessageBox.critical(self, "GPU Required", "CUDA GPU not available. Cannot start detection.")
-                return
-            self.cap = cv2.VideoCapture(file_name)
-            self.apply_saved_roi()
-            self._last_time = None
-            self._fps = 0.0
-            self.mode_label.setText("Mode: File")
-            self.current_mode = "File"
-            self.is_paused = False
-            self.btn_pause.setEnabled(True)
-            self.btn_pause.setText("Pause")
-            self.timer.start(30)
+
+    def stop_capture(self):
+        self.timer.stop()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
+        if self.grabber is not None:
+            self.grabber.stop()
+            self.grabber = None
             
     def toggle_pause(self):
-        if self.cap is None or not self.cap.isOpened():
+        if self.grabber is None or not self.grabber.is_opened():
             return
         if not self.is_paused:
             # Pause
             try:
                 self.timer.stop()
+                self.grabber.pause()
             except Exception:
                 pass
             self.is_paused = True
@@ -1332,6 +1780,7 @@ class MainWindow(QMainWindow):
         else:
             # Resume
             try:
+                self.grabber.resume()
                 self.timer.start(30)
             except Exception:
                 pass
@@ -1341,193 +1790,228 @@ class MainWindow(QMainWindow):
             self._last_time = None
             
     def update_frame(self):
-        if self.cap is not None and self.cap.isOpened():
-            ret, frame = self.cap.read()
-            if not ret:
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                ret, frame = self.cap.read()
-                if not ret:
-                    return
-            processed_frame = self.process_frame(frame)
-            rgb_frame = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
-            height, width, channels = rgb_frame.shape
-            bytes_per_line = channels * width
-            q_img = QImage(rgb_frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
-            pix = QPixmap.fromImage(q_img)
-            # Scale the pixmap to fit the video label while keeping its aspect ratio.
-            pix = pix.scaled(self.video_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.video_label.setPixmap(pix)
-            # FPS calculation (EMA)
-            now = time.time()
-            if self._last_time is not None:
-                inst_fps = 1.0 / max(1e-6, (now - self._last_time))
-                self._fps = 0.9 * self._fps + 0.1 * inst_fps if self._fps > 0 else inst_fps
-                self.fps_label.setText(f"FPS: {self._fps:.1f}")
-            self._last_time = now
+        if self.pipeline is None:
+            return
+        self.update_governor_status()
+        # Publish the ROI for the detect stage; worker threads never touch Qt widgets.
+        self.roi_snapshot = self.current_roi_snapshot()
+        jobs = self.pipeline.output.drain()
+        if not jobs:
+            return
+        # One insert for everything logged since the last tick.
+        self.append_detection_info([d for job in jobs for d in job.new_detections])
+        job = max(jobs, key=lambda j: j.seq)
+        if job.seq <= self._last_shown_seq:
+            return
+        self._last_shown_seq = job.seq
+        rgb_frame = cv2.cvtColor(job.frame, cv2.COLOR_BGR2RGB)
+        height, width, channels = rgb_frame.shape
+        bytes_per_line = channels * width
+        q_img = QImage(rgb_frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
+        pix = QPixmap.fromImage(q_img)
+        # Scale the pixmap to fit the video label while keeping its aspect ratio.
+        pix = pix.scaled(self.video_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.video_label.setPixmap(pix)
+        # FPS calculation (EMA)
+        now = time.time()
+        if self._last_time is not None:
+            inst_fps = 1.0 / max(1e-6, (now - self._last_time))
+            self._fps = 0.9 * self._fps + 0.1 * inst_fps if self._fps > 0 else inst_fps
+            self.fps_label.setText(f"FPS: {self._fps:.1f}")
+        self._last_time = now
+        self.queue_label.setText(f"Queues: {self.pipeline.depth_summary()}")
+        if self.motion_gate is not None:
+            self.motion_label.setText(f"Motion: skipped {self.motion_gate.frames_skipped}/{self.motion_gate.frames_checked}")
+        with self.ocr_path_lock:
+            ocr_path_counts = sorted(self.ocr_path_counts.items())
+        self.ocr_label.setText("OCR " + " ".join(f"{path}:{n}" for path, n in ocr_path_counts)
+                               + f" skipped:{self.tracker.ocr_skipped}"
+                               + (f" hits:{self.ocr_cache.stats()['hit_rate']:.0%}" if self.ocr_cache is not None else ""))
+
+    def update_governor_status(self):
+        if self.governor is None:
+            return
+        mode = self.governor.mode(time.monotonic())
+        if mode == self.governor_label.property("mode"):
+            return
+        self.governor_label.setProperty("mode", mode)
+        self.governor_label.setText(f"Rate: {mode}")
+        self.governor_label.setObjectName("BadgeSuccess" if mode == FrameRateGovernor.ACTIVE else "BadgeInfo")
+        self.governor_label.style().polish(self.governor_label)
+        # Idle lanes also redraw less often.
+        self.timer.setInterval(30 if mode == FrameRateGovernor.ACTIVE else 100)
+
+    def current_roi_snapshot(self):
+        """The finished ROI normalised to the frame (an immutable tuple), or None for the fixed area."""
+        if self.video_label.roi_norm and self.video_label.poly_finished:
+            return self.video_label.roi_norm
+        return None
             
-    def process_plate_image(self, plate_image):
-        try:
-            # Convert to grayscale.
-            gray = cv2.cvtColor(plate_image, cv2.COLOR_BGR2GRAY)
-            # Apply brightness normalization (CLAHE) for bright areas.
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            gray = clahe.apply(gray)
-            # Resize for better OCR accuracy.
-            gray = cv2.resize(gray, None, fx=1.5, fy=1.5, interpolation=cv2.INTER_CUBIC)
-            # Denoise the image.
-            gray = cv2.fastNlMeansDenoising(gray, None, h=15, searchWindowSize=21, templateWindowSize=7)
-            results = self.ocr_reader.ocr(gray, cls=False)
-            if results is not None and len(results) > 0:
-                best_text = ""
-                best_conf = 0.0
-                # Simply select the result with the highest confidence, no regex or length filtering.
-                for result in results[0]:
-                    if len(result) >= 2:
-                        text = result[1][0]
-                        confidence = round(float(result[1][1]), 2)
-                        if confidence > best_conf:
-                            best_conf = confidence
-                            best_text = text.replace(" ","").strip()
-                if best_conf >= self.ocr_conf_threshold:
-                    return best_text, best_conf
-            return "", 0.0
-        except Exception as e:
-            print(f"Error in plate processing: {e}")
-            return "", 0.0
-        
-    def process_frame(self, frame):
+    # ---------------------------- Pipeline stages ----------------------------
+    # capture -> detect -> ocr -> sink, each on its own worker thread. Results
+    # land in self.pipeline.output and are drawn/tabled by update_frame.
+
+    def capture_stage(self):
+        grabber = self.grabber
+        if grabber is None:
+            time.sleep(0.05)
+            return None
+        captured = grabber.latest(after_seq=self._last_frame_seq, timeout=0.1)
+        if captured is None:
+            return None
+        self._last_frame_seq = captured.seq
+        if self.governor is not None and not self.governor.admit(captured.timestamp):
+            return None
+        return FrameJob(captured.seq, captured.timestamp, captured.image)
+
+    def detect_stage(self, job):
+        if time.monotonic() - job.timestamp > MAX_FRAME_AGE:
+            # Waited too long for the detector; a newer frame is already behind it.
+            self.stale_frames += 1
+            return None
         padding = 5  # Padding to expand the detected bounding box for OCR.
+        frame = job.frame
+        frame_height, frame_width, _ = frame.shape
+        roi_snapshot = self.roi_snapshot
         # If an ROI is defined by the user, use that ROI.
-        if self.video_label.roi_points and self.video_label.poly_finished:
-            points = [(pt.x(), pt.y()) for pt in self.video_label.roi_points]
-            pts = np.array(points)
-            x, y, w, h = cv2.boundingRect(pts)
-            label_width = self.video_label.width()
-            label_height = self.video_label.height()
-            frame_height, frame_width, _ = frame.shape
-            scale_x = frame_width / label_width
-            scale_y = frame_height / label_height
-            x_frame = int(x * scale_x)
-            y_frame = int(y * scale_y)
-            w_frame = int(w * scale_x)
-            h_frame = int(h * scale_y)
-            if w_frame <= 0 or h_frame <= 0:
-                return frame
-            if x_frame + w_frame > frame_width:
-                w_frame = frame_width - x_frame
-            if y_frame + h_frame > frame_height:
-                h_frame = frame_height - y_frame
+        if roi_snapshot is not None:
+            job.roi = self.roi_cache.get(roi_snapshot, (frame_width, frame_height), normalized=True)
+            if job.roi.is_empty():
+                return job
+            x_frame, y_frame, w_frame, h_frame = job.roi.rect
+            if not self.motion_allows(job, job.roi.rect):
+                return job
             roi = frame[y_frame:y_frame+h_frame, x_frame:x_frame+w_frame].copy()
-            results = self.model(roi, device=0)
-            if results and results[0].boxes is not None and len(results[0].boxes) > 0:
-                detections = results[0].boxes.data.cpu().numpy()
-                for det in detections:
-                    conf_val = det[4]
-                    if conf_val >= self.plate_conf_threshold:
-                        bx1, by1, bx2, by2, conf_val, cls = det
-                        # Map detection coordinates back to original frame.
-                        x_det1 = max(x_frame + int(bx1) - padding, 0)
-                        y_det1 = max(y_frame + int(by1) - padding, 0)
-                        x_det2 = min(x_frame + int(bx2) + padding, frame.shape[1])
-                        y_det2 = min(y_frame + int(by2) + padding, frame.shape[0])
-                        cv2.rectangle(frame, (x_det1, y_det1), (x_det2, y_det2), (0, 255, 0), 2)
-                        roi_plate = frame[y_det1:y_det2, x_det1:x_det2]
-                        if roi_plate.size > 0:
-                            plate_text, ocr_conf = self.process_plate_image(roi_plate)
-                        else:
-                            plate_text, ocr_conf = "", 0.0
-                        if plate_text:
-                            current_time = datetime.now()
-                            if (plate_text in self.last_detection_times and 
-                                (current_time - self.last_detection_times[plate_text]).total_seconds() < self.detection_interval):
-                                detection_id = self.last_detection_ids[plate_text]
-                            else:
-                                self.plate_id_counter += 1
-                                detection_id = self.plate_id_counter
-                                self.last_detection_times[plate_text] = current_time
-                                self.last_detection_ids[plate_text] = detection_id
-                                self.append_detection_info(detection_id, plate_text, ocr_conf, conf_val)
-                                self.log_detection(detection_id, plate_text, ocr_conf, conf_val)
-                            # Open gate for target plate (always check, debounced in controller)
-                            try:
-                                if plate_text.upper() == TARGET_PLATE.upper():
-                                    self.gate_controller.open_gate()
-                            except Exception:
-                                pass
-                            cv2.putText(frame, f"ID: {detection_id}", (x_det1, y_det1 - 10),
-                                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+            # Threshold, map back to the frame, pad and clamp all boxes at once.
+            boxes = job.roi.filter_boxes(self.detector.detect(roi), self.plate_conf_threshold,
+                                         offset=(x_frame, y_frame), padding=padding)
         else:
             # If no ROI is defined, use the fixed polygon area.
-            cv2.polylines(frame, [np.array(self.fixed_area, np.int32)], True, (255, 0, 0), 2)
-            results = self.model(frame, device=0)
-            if results and results[0].boxes is not None and len(results[0].boxes) > 0:
-                detections = results[0].boxes.data.cpu().numpy()
-                for det in detections:
-                    conf_val = det[4]
-                    if conf_val >= self.plate_conf_threshold:
-                        bx1, by1, bx2, by2, conf_val, cls = det
-                        # Compute the detection center.
-                        cx = (int(bx1) + int(bx2)) // 2
-                        cy = (int(by1) + int(by2)) // 2
-                        # Check if the center lies inside the fixed area.
-                        pt_result = cv2.pointPolygonTest(np.array(self.fixed_area, np.int32), (cx, cy), False)
-                        if pt_result < 0:
-                            continue
-                        x_det1 = max(int(bx1) - padding, 0)
-                        y_det1 = max(int(by1) - padding, 0)
-                        x_det2 = min(int(bx2) + padding, frame.shape[1])
-                        y_det2 = min(int(by2) + padding, frame.shape[0])
-                        cv2.rectangle(frame, (x_det1, y_det1), (x_det2, y_det2), (0, 255, 0), 2)
-                        roi_plate = frame[y_det1:y_det2, x_det1:x_det2]
-                        if roi_plate.size > 0:
-                            plate_text, ocr_conf = self.process_plate_image(roi_plate)
-                        else:
-                            plate_text, ocr_conf = "", 0.0
-                        if plate_text:
-                            current_time = datetime.now()
-                            if (plate_text in self.last_detection_times and 
-                                (current_time - self.last_detection_times[plate_text]).total_seconds() < self.detection_interval):
-                                detection_id = self.last_detection_ids[plate_text]
-                            else:
-                                self.plate_id_counter += 1
-                                detection_id = self.plate_id_counter
-                                self.last_detection_times[plate_text] = current_time
-                                self.last_detection_ids[plate_text] = detection_id
-                                self.append_detection_info(detection_id, plate_text, ocr_conf, conf_val)
-                                self.log_detection(detection_id, plate_text, ocr_conf, conf_val)
-                            # Open gate for target plate (always check, debounced in controller)
-                            try:
-                                if plate_text.upper() == TARGET_PLATE.upper():
-                                    self.gate_controller.open_gate()
-                            except Exception:
-                                pass
-                            cv2.putText(frame, f"ID: {detection_id}", (x_det1, y_det1 - 10),
-                                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-        return frame
-
-    def append_detection_info(self, plate_id, plate_text, ocr_conf, plate_conf):
-        row = self.table_detections.rowCount()
-        self.table_detections.insertRow(row)
-        self.table_detections.setItem(row, 0, QTableWidgetItem(str(plate_id)))
-        self.table_detections.setItem(row, 1, QTableWidgetItem(plate_text))
-        # OCR confidence (blue)
-        ocr_bar = QProgressBar()
-        ocr_bar.setRange(0, 100)
-        ocr_bar.setValue(int(round(ocr_conf * 100)))
-        ocr_bar.setFormat(f"{ocr_conf:.2f}")
-        ocr_bar.setTextVisible(True)
-        ocr_bar.setStyleSheet("QProgressBar::chunk{background-color:#3b82f6;border-radius:6px;} QProgressBar{border-radius:6px;}")
-        self.table_detections.setCellWidget(row, 2, ocr_bar)
-        # Plate confidence (green)
-        plate_bar = QProgressBar()
-        plate_bar.setRange(0, 100)
-        plate_bar.setValue(int(round(plate_conf * 100)))
-        plate_bar.setFormat(f"{plate_conf:.2f}")
-        plate_bar.setTextVisible(True)
-        plate_bar.setStyleSheet("QProgressBar::chunk{background-color:#10b981;border-radius:6px;} QProgressBar{border-radius:6px;}")
-        self.table_detections.setCellWidget(row, 3, plate_bar)
-        self.table_detections.setItem(row, 4, QTableWidgetItem(datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
-        self.count_label.setText(f"Detections: {self.table_detections.rowCount()}")
+            job.fixed_area = True
+            job.roi = self.roi_cache.get(self.fixed_area, (frame_width, frame_height))
+            if not self.motion_allows(job, job.roi.rect):
+                return job
+            # Same, keeping only boxes whose centre lies inside the fixed area (mask lookup).
+            boxes = job.roi.filter_boxes(self.detector.detect(frame), self.plate_conf_threshold,
+                                         padding=padding, inside=True)
+        job.boxes = box_tuples(boxes)
+        job.track_ids = self.tracker.update(job.boxes, job.timestamp)
+        if job.boxes and self.governor is not None:
+            self.governor.notify_activity(job.timestamp)
+        return job
+
+    def motion_allows(self, job, rect):
+        if self.motion_gate is None:
+            return True
+        if self.motion_gate.check(job.frame, rect, job.timestamp):
+            if self.governor is not None:
+                self.governor.notify_activity(job.timestamp)
+            return True
+        # Nothing moved: skip YOLO but keep ageing the tracker so departed plates get logged.
+        job.track_ids = self.tracker.update([], job.timestamp)
+        return False
+
+    def ocr_stage(self, jobs):
+        # Batched stage: jobs holds every frame queued for OCR (or arriving within the batch window).
+        # Only tracks that are due (per the tracker's cadence and confirmation) are read.
+        crops, owners = [], []
+        for job in jobs:
+            for box, track_id in zip(job.boxes, job.track_ids):
+                if self.tracker.claim_ocr(track_id, job.timestamp):
+                    x_det1, y_det1, x_det2, y_det2, _ = box
+                    crops.append(job.frame[y_det1:y_det2, x_det1:x_det2])
+                    owners.append((job, track_id))
+        ocr_paths = {}
+        results = self.recognize_crops(crops)
+        with self.ocr_path_lock:
+            self.ocr_path_counts.update(ocr_path for _, _, ocr_path in results)
+        for (job, track_id), (plate_text, ocr_conf, ocr_path) in zip(owners, results):
+            if ocr_conf < self.ocr_conf_threshold:
+                plate_text, ocr_conf = "", 0.0
+            # A cache hit echoes an earlier reading of the same crop; it is not a new vote.
+            if ocr_path != PATH_CACHE:
+                self.tracker.record_ocr(track_id, plate_text, ocr_conf)
+            ocr_paths[(job.seq, track_id)] = ocr_path
+        for job in jobs:
+            for box, track_id in zip(job.boxes, job.track_ids):
+                track = self.tracker.get(track_id)
+                plate_text, ocr_conf = (track.text, track.text_conf) if track is not None else ("", 0.0)
+                job.plates.append((box, track_id, plate_text, ocr_conf, ocr_paths.get((job.seq, track_id))))
+        return jobs
+
+    def recognize_crops(self, crops):
+        """(text, conf, ocr_path) for each crop, in input order."""
+        if not crops:
+            return []
+        if self.ocr_cache is None:
+            return self.read_crops(crops)
+        # Near-identical crops (a vehicle waiting at the barrier) reuse a recent reading.
+        now = time.monotonic()
+        keys = [plate_hash(crop) for crop in crops]
+        results = [self.ocr_cache.get(key, now) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        results = [result[:2] + (PATH_CACHE,) if result is not None else None for result in results]
+        for i, result in zip(misses, self.read_crops([crops[i] for i in misses])):
+            self.ocr_cache.put(keys[i], result, now)
+            results[i] = result
+        return results
+
+    def read_crops(self, crops):
+        if not crops:
+            return []
+        if self.ocr_pool is not None:
+            return self.ocr_pool.read_plates(crops, self.ocr_conf_threshold, self.ocr_rec_only, self.ocr_batch,
+                                             self.ocr_two_pass, self.ocr_plate_pattern)
+        return read_plates(self.ocr_reader, crops, self.ocr_conf_threshold, self.ocr_rec_only, self.ocr_batch,
+                           self.ocr_two_pass, self.ocr_plate_pattern)
+
+    def sink_stage(self, job):
+        frame = job.frame
+        if job.fixed_area:
+            cv2.polylines(frame, [job.roi.polygon], True, (255, 0, 0), 2)
+        for box, track_id, plate_text, ocr_conf, ocr_path in job.plates:
+            x_det1, y_det1, x_det2, y_det2, conf_val = box
+            cv2.rectangle(frame, (x_det1, y_det1), (x_det2, y_det2), (0, 255, 0), 2)
+            if plate_text:
+                # Logged once per track, when its character vote is settled.
+                ready = self.tracker.take_ready(track_id)
+                if ready is not None:
+                    self.register_detection(job, ready)
+                # Open gate for target plate (always check, debounced in controller)
+                try:
+                    if plate_text.upper() == TARGET_PLATE.upper():
+                        self.gate_controller.open_gate()
+                except Exception:
+                    pass
+                cv2.putText(frame, f"ID: {track_id}", (x_det1, y_det1 - 10),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+        # Tracks that left before their vote settled are logged with what they have.
+        for track in self.tracker.pop_finished():
+            self.register_detection(job, track)
+        return job
+
+    def register_detection(self, job, track):
+        # Runs on the sink worker; reset_data clears the same state from the GUI thread.
+        # Each track is logged once, under its track ID, with its consensus reading.
+        track_id, plate_text, ocr_conf, conf_val = track.track_id, track.text, track.text_conf, track.plate_conf
+        with self.detection_lock:
+            if not self.recent_plates.add(plate_text, track_id):
+                return  # same plate re-entered the ROI as a new track; already logged
+            self.log_detection(track_id, plate_text, ocr_conf, conf_val)
+        job.new_detections.append((track_id, plate_text, ocr_conf, conf_val))
+
+    def append_detection_info(self, detections):
+        """Add (plate_id, plate_text, ocr_conf, plate_conf) tuples to the detection log."""
+        if not detections:
+            return
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.detections_model.append_rows([(plate_id, plate_text, ocr_conf, plate_conf, timestamp)
+                                           for plate_id, plate_text, ocr_conf, plate_conf in detections])
+        self.count_label.setText(f"Detections: {self.detections_model.rowCount()}")
+        stats = self.recent_plates.stats()
+        self.count_label.setToolTip(f"Duplicate filter: {stats['size']} recent plates, {stats['suppressed']} repeats "
+                                    f"suppressed ({stats['fuzzy']} OCR variants), {stats['expired']} expired, "
+                                    f"{stats['evicted']} evicted")
 
     def log_detection(self, plate_id, plate_text, ocr_conf, plate_conf):
         date_str = datetime.now().strftime("%Y-%m-%d")
@@ -1541,10 +2025,18 @@ class MainWindow(QMainWindow):
             writer.writerow([timestamp, plate_id, plate_text, f"{ocr_conf:.2f}", f"{plate_conf:.2f}"])
 
     def reset_data(self):
-        self.last_detection_times.clear()
-        self.last_detection_ids.clear()
-        self.plate_id_counter = 0
-        self.table_detections.setRowCount(0)
+        with self.detection_lock:
+            self.recent_plates.clear()
+            self.tracker.reset()
+        # Drop a load still in progress; it would bring back the rows being reset.
+        if self.history_loader is not None:
+            self.history_timer.stop()
+            self.history_loader = None
+            if self.pending_source is not None:
+                source, mode = self.pending_source
+                self.pending_source = None
+                self.start_capture(source, mode)
+        self.detections_model.clear()
         self.count_label.setText("Detections: 0")
         date_str = datetime.now().strftime("%Y-%m-%d")
         filename = os.path.join(DATA_LOG_DIR, f"detections_{date_str}.csv")
@@ -1559,12 +2051,15 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         self.save_ui_state()
+        self.stop_capture()
+        self.model_timer.stop()
+        self.history_timer.stop()
+        if self.model_loader is not None:
+            self.model_loader.shutdown()
         try:
             self.gate_controller.close()
         except Exception:
             pass
-        if self.cap is not None:
-            self.cap.release()
         event.accept()
 
 ########################################################################
@@ -1577,6 +2072,9 @@ if __name__ == '__main__':
         QCoreApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     except Exception:
         pass
+    # Needed for the OCR worker processes in a frozen (PyInstaller) build on Windows.
+    multiprocessing.freeze_support()
+    _t = time.perf_counter()
     app = QApplication(sys.argv)
     try:
         app.setStyle(QStyleFactory.create("Fusion"))
@@ -1593,12 +2091,35 @@ if __name__ == '__main__':
     except Exception:
         pass
 
+    _t = startup_step("QApplication + style", _t)
+
+    # With preload_models, start loading the models now so they warm up while the operator logs in.
+    app_settings = read_app_settings()
+    splash = QSplashScreen(create_app_icon().pixmap(256, 256))
+    splash.show()
+    splash.showMessage("Loading models..." if app_settings["preload_models"] else "Starting...",
+                       Qt.AlignBottom | Qt.AlignHCenter, Qt.white)
+    app.processEvents()
+    model_loader = create_model_loader(app_settings) if app_settings["preload_models"] else None
+    _t = startup_step("splash", _t)
+
     # Show login before main window
     login = LoginDialog()
+    splash.finish(login)
+    _t = startup_step("login dialog", _t)
     if login.exec():
+        _t = time.perf_counter()
         user = login.get_username()
-        window = MainWindow(username=user)
+        splash.show()
+        splash.showMessage("Starting...", Qt.AlignBottom | Qt.AlignHCenter, Qt.white)
+        app.processEvents()
+        window = MainWindow(username=user, model_loader=model_loader)
         window.show()
+        splash.finish(window)
+        startup_step("main window", _t)
+        print_startup_report()
         sys.exit(app.exec())
     else:
+        if model_loader is not None:
+            model_loader.shutdown()
         sys.exit(0)
@@ -0,0 +1,216 @@
+import os, threading, time
+
+import numpy as np
+
+from detection_log import CSV_COLUMNS, read_columns
+
+########################################################################
+# MergedExport: writes a range of day files as one CSV, XLSX or Parquet
+# file on a background thread, one day file at a time in date order, so
+# memory stays at about one day's rows however long the range is.
+#   CSV      one header, then each day file's bytes after its own header.
+#   XLSX     rows are streamed with xlsxwriter in constant_memory mode, or
+#            an openpyxl write-only workbook if xlsxwriter is missing; a
+#            sheet holds at most XLSX_MAX_ROWS rows, then a new one starts.
+#   Parquet  one row group per day file (pyarrow).
+# The GUI polls state()/progress() from a QTimer and can cancel(); a
+# cancelled or failed export removes its partial output file.
+########################################################################
+
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FORMAT_CSV = "csv"
+FORMAT_XLSX = "xlsx"
+FORMAT_PARQUET = "parquet"
+FORMATS = (FORMAT_XLSX, FORMAT_CSV, FORMAT_PARQUET)
+
+XLSX_MAX_ROWS = 1048575     # Excel's 1,048,576 rows per sheet, less the header
+COPY_CHUNK = 1 << 20
+
+
+def export_format(path: str) -> str:
+    """Output format from the file extension (xlsx when unknown)."""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return ext if ext in FORMATS else FORMAT_XLSX
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def cell_columns(columns: dict):
+    """Columns (in CSV_COLUMNS order) as written to a file: confidences back to the logged 2-decimal values."""
+    return [columns[name].astype(np.float64).round(2) if columns[name].dtype == np.float32 else columns[name]
+            for name in CSV_COLUMNS]
+
+
+class _XlsxWriter:
+    def __init__(self, path: str):
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+        if xlsxwriter is not None:
+            self._book = xlsxwriter.Workbook(path, {"constant_memory": True})
+            self._openpyxl = False
+        else:
+            try:
+                from openpyxl import Workbook
+            except ImportError:
+                raise RuntimeError("XLSX export needs xlsxwriter or openpyxl (pip install xlsxwriter)")
+            self._book = Workbook(write_only=True)
+            self._openpyxl = True
+        self.path = path
+        self._sheets = 0
+        self._sheet = None
+        self._row = XLSX_MAX_ROWS  # forces the first sheet
+
+    def _new_sheet(self):
+        self._sheets += 1
+        name = "detections" if self._sheets == 1 else f"detections_{self._sheets}"
+        if self._openpyxl:
+            self._sheet = self._book.create_sheet(name)
+            self._sheet.append(CSV_COLUMNS)
+        else:
+            self._sheet = self._book.add_worksheet(name)
+            self._sheet.write_row(0, 0, CSV_COLUMNS)
+        self._row = 0
+
+    def write(self, columns: dict):
+        for row in zip(*(c.tolist() for c in cell_columns(columns))):
+            if self._row >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            self._row += 1
+            if self._openpyxl:
+                self._sheet.append(row)
+            else:
+                self._sheet.write_row(self._row, 0, row)
+
+    def close(self):
+        if self._sheet is None:
+            self._new_sheet()
+        if self._openpyxl:
+            self._book.save(self.path)
+        else:
+            self._book.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        self._pa = pa
+        self._schema = pa.schema([("Timestamp", pa.string()), ("Plate ID", pa.int64()), ("Plate Number", pa.string()),
+                                  ("OCR Confidence", pa.float64()), ("Plate Confidence", pa.float64())])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, columns: dict):
+        arrays = [self._pa.array(values, type=field.type)
+                  for values, field in zip(cell_columns(columns), self._schema)]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+class MergedExport:
+    def __init__(self, paths, output: str):
+        self.paths = list(paths)    # written in this order (date order)
+        self.output = output
+        self.format = export_format(output)
+        self.files_done = 0
+        self.rows = 0
+        self.failed = []            # (path, error) for day files that could not be read
+        self.error = None
+        self.seconds = 0.0
+        self._state = RUNNING
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self._run, name="MergedExport", daemon=True).start()
+        return self
+
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def progress(self) -> float:
+        return self.files_done / len(self.paths) if self.paths else 1.0
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _check(self):
+        if self._cancelled:
+            raise _Cancelled()
+
+    def _copy_csv(self):
+        # csv.writer's "\r\n" line ending, as in the day files the app logs.
+        with open(self.output, "wb") as out:
+            out.write((",".join(CSV_COLUMNS) + "\r\n").encode())
+            for path in self.paths:
+                self._check()
+                try:
+                    with open(path, "rb") as f:
+                        f.readline()    # the day file's own header
+                        rows, last = 0, b""
+                        while True:
+                            self._check()
+                            chunk = f.read(COPY_CHUNK)
+                            if not chunk:
+                                break
+                            out.write(chunk)
+                            rows += chunk.count(b"\n")
+                            last = chunk
+                        if last and not last.endswith(b"\n"):
+                            out.write(b"\r\n")
+                            rows += 1
+                        self.rows += rows
+                except OSError as e:
+                    self.failed.append((path, e))
+                self.files_done += 1
+
+    def _write_columns(self, writer):
+        try:
+            for path in self.paths:
+                self._check()
+                try:
+                    columns = read_columns(path)
+                except Exception as e:
+                    self.failed.append((path, e))
+                else:
+                    writer.write(columns)
+                    self.rows += len(columns["Timestamp"])
+                self.files_done += 1
+        finally:
+            writer.close()
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            if self.format == FORMAT_CSV:
+                self._copy_csv()
+            else:
+                self._write_columns(_ParquetWriter(self.output) if self.format == FORMAT_PARQUET
+                                    else _XlsxWriter(self.output))
+            state = DONE
+        except _Cancelled:
+            state = CANCELLED
+        except Exception as e:
+            self.error = e
+            state = FAILED
+        if state != DONE and os.path.exists(self.output):
+            try:
+                os.remove(self.output)
+            except OSError:
+                pass
+        self.seconds = time.perf_counter() - started
+        with self._lock:
+            self._state = state
@@ -0,0 +1,101 @@
+import threading, time
+
+import numpy as np
+
+from detector import create_detector
+from ocr_engine import OcrPool, create_reader, read_plates, set_preprocess, warm_up_image
+
+########################################################################
+# ModelLoader: builds the plate detector and the OCR engine on a background
+# thread while login and the main window come up, then runs one warm-up
+# inference on each so the first real frame does not pay the cold start.
+# The GUI polls state() from a QTimer; this thread never touches Qt widgets.
+########################################################################
+
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelLoader:
+    def __init__(self, weights: str, detector_backend: str, intra_op_threads: int = 0, inter_op_threads: int = 0,
+                 ocr_workers: int = 2, ocr_threads_per_worker: int = 1, ocr_max_batch: int = 16,
+                 ocr_preprocess="default", ocr_fast_preprocess="fast"):
+        self.weights = weights
+        self.detector_backend = detector_backend
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.ocr_workers = ocr_workers
+        self.ocr_threads_per_worker = ocr_threads_per_worker
+        self.ocr_max_batch = ocr_max_batch
+        self.ocr_preprocess = ocr_preprocess
+        self.ocr_fast_preprocess = ocr_fast_preprocess
+        self.detector = None
+        self.ocr_pool = None
+        self.ocr_reader = None
+        self.error = None
+        self.timings = {}       # step -> seconds
+        self._state = LOADING
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="ModelLoader", daemon=True)
+        self._thread.start()
+        return self
+
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _timed(self, step, fn):
+        started = time.perf_counter()
+        result = fn()
+        self.timings[step] = time.perf_counter() - started
+        return result
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            detector = self._timed("detector", lambda: create_detector(
+                self.weights, self.detector_backend, self.intra_op_threads, self.inter_op_threads))
+            self._timed("detector warm-up", lambda: detector.detect(np.zeros((480, 640, 3), np.uint8)))
+            # PaddleOCR runs on CPU, either in a pool of worker processes or in-process.
+            if self.ocr_workers > 0:
+                ocr_pool = self._timed("ocr", lambda: OcrPool(
+                    self.ocr_workers, self.ocr_threads_per_worker, self.ocr_max_batch,
+                    self.ocr_preprocess, self.ocr_fast_preprocess))
+                self._timed("ocr warm-up", ocr_pool.warm_up)
+                ocr_reader = None
+            else:
+                ocr_pool = None
+                set_preprocess(self.ocr_preprocess, self.ocr_fast_preprocess)
+                ocr_reader = self._timed("ocr", lambda: create_reader(rec_batch_num=self.ocr_max_batch))
+                self._timed("ocr warm-up", lambda: read_plates(ocr_reader, [warm_up_image()], 0.0))
+        except Exception as e:
+            print(f"[Models] Loading failed: {e}")
+            with self._lock:
+                self.error = e
+                self._state = FAILED
+            return
+        self.timings["total"] = time.perf_counter() - started
+        with self._lock:
+            if self._closed:
+                # Window closed while loading; nobody will shut the pool down later.
+                if ocr_pool is not None:
+                    ocr_pool.shutdown()
+                return
+            self.detector = detector
+            self.ocr_pool = ocr_pool
+            self.ocr_reader = ocr_reader
+            self._state = READY
+        print("[Models] Ready: " + ", ".join(f"{step} {secs:.1f}s" for step, secs in self.timings.items()))
+
+    def shutdown(self):
+        """Release the OCR pool, now or as soon as loading finishes."""
+        with self._lock:
+            self._closed = True
+            ocr_pool, self.ocr_pool = self.ocr_pool, None
+        if ocr_pool is not None:
+            ocr_pool.shutdown()
@@ -0,0 +1,114 @@
+import threading
+
+import cv2
+import numpy as np
+
+########################################################################
+# MotionGate: cheap motion check inside the ROI bounding rect that decides
+# whether a frame is worth sending to YOLO. The ROI patch is downscaled,
+# blurred and compared against a running-average background; if enough
+# pixels changed, detection runs (and keeps running for hold_off seconds
+# after the last motion so a car that stops at the barrier is still read).
+########################################################################
+
+
+class MotionGate:
+    def __init__(self, sensitivity: float = 0.01, pixel_threshold: int = 25, hold_off: float = 2.0,
+                 width: int = 160, learning_rate: float = 0.05):
+        self.sensitivity = sensitivity          # fraction of changed pixels that counts as motion
+        self.pixel_threshold = pixel_threshold  # grey-level difference that counts as a changed pixel
+        self.hold_off = hold_off                # seconds detection stays on after the last motion
+        self.width = width                      # working width of the downscaled ROI patch
+        self.learning_rate = learning_rate
+        self.frames_checked = 0
+        self.frames_skipped = 0
+        self.last_motion = None
+        self.last_changed = 0.0
+        self._background = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._background = None
+            self.last_motion = None
+
+    def check(self, frame, rect, now: float) -> bool:
+        """True if the frame should go to the detector."""
+        x, y, w, h = rect
+        patch = frame[y:y+h, x:x+w]
+        if patch.size == 0:
+            return True
+        height = max(1, int(round(h * self.width / float(w))))
+        small = cv2.resize(patch, (self.width, height), interpolation=cv2.INTER_AREA)
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        small = cv2.GaussianBlur(small, (5, 5), 0)
+        with self._lock:
+            self.frames_checked += 1
+            if self._background is None or self._background.shape != small.shape:
+                # First frame or ROI changed: no reference yet, so let it through.
+                self._background = small.astype(np.float32)
+                self.last_motion = now
+                return True
+            diff = cv2.absdiff(small, cv2.convertScaleAbs(self._background))
+            self.last_changed = float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+            cv2.accumulateWeighted(small, self._background, self.learning_rate)
+            if self.last_changed >= self.sensitivity:
+                self.last_motion = now
+            if self.last_motion is not None and now - self.last_motion <= self.hold_off:
+                return True
+            self.frames_skipped += 1
+            return False
+
+    def stats(self) -> dict:
+        return {"checked": self.frames_checked, "skipped": self.frames_skipped, "changed": self.last_changed}
+
+
+########################################################################
+# FrameRateGovernor: throttles how many frames enter the pipeline. After
+# idle_after seconds without motion or a plate the lane goes Idle and only
+# one frame per idle_interval is admitted; any activity switches straight
+# back to Active (every frame). idle_interval never exceeds max_latency, the
+# worst-case delay before a newly arrived vehicle reaches the detector.
+########################################################################
+
+
+class FrameRateGovernor:
+    ACTIVE = "Active"
+    IDLE = "Idle"
+
+    def __init__(self, idle_after: float = 10.0, idle_fps: float = 2.0, max_latency: float = 1.0):
+        self.idle_after = idle_after
+        self.idle_interval = min(1.0 / idle_fps if idle_fps > 0 else max_latency, max_latency)
+        self.admitted = 0
+        self.throttled = 0
+        self._last_activity = None
+        self._last_admit = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._last_activity = None
+            self._last_admit = None
+
+    def notify_activity(self, now: float):
+        with self._lock:
+            self._last_activity = now
+
+    def mode(self, now: float) -> str:
+        if self._last_activity is None or now - self._last_activity <= self.idle_after:
+            return self.ACTIVE
+        return self.IDLE
+
+    def admit(self, now: float) -> bool:
+        """True if a frame captured at now should be processed."""
+        with self._lock:
+            # Start Active: a fresh source gets full rate until it proves idle.
+            if self._last_activity is None:
+                self._last_activity = now
+            if (self.mode(now) == self.ACTIVE or self._last_admit is None
+                    or now - self._last_admit >= self.idle_interval):
+                self._last_admit = now
+                self.admitted += 1
+                return True
+            self.throttled += 1
+            return False
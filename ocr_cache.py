@@ -0,0 +1,77 @@
+import threading, time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+########################################################################
+# OcrCache: LRU cache of OCR results keyed by a perceptual hash of the
+# plate crop. A stopped or slow vehicle gives near-identical crops frame
+# after frame; a crop whose dHash is within max_distance bits of a cached
+# one reuses that (text, conf) instead of going through PaddleOCR again.
+# Entries expire ttl seconds after they were read, and the least recently
+# used entry is evicted once the cache holds max_size crops.
+########################################################################
+
+HASH_WIDTH = 16   # dHash grid; plates are wide, so more columns than rows
+HASH_HEIGHT = 8
+
+
+def plate_hash(image) -> int:
+    """128-bit difference hash of a BGR or grey crop (horizontal gradient signs)."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (HASH_WIDTH + 1, HASH_HEIGHT), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class OcrCache:
+    def __init__(self, max_size: int = 256, ttl: float = 3.0, max_distance: int = 6):
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl                    # seconds a reading stays valid
+        self.max_distance = max_distance  # Hamming tolerance between crop hashes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()     # hash -> (result, stored_at); oldest use first
+        self._lock = threading.Lock()
+
+    def get(self, key: int, now: float = None):
+        """Cached result for a crop hash (exact or within max_distance), or None."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[1] > self.ttl:
+                entry = None
+                for other, (result, stored_at) in list(self._entries.items()):
+                    if now - stored_at > self.ttl:
+                        del self._entries[other]
+                    elif entry is None and hamming(key, other) <= self.max_distance:
+                        key, entry = other, (result, stored_at)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: int, result, now: float = None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries[key] = (result, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
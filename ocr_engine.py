@@ -0,0 +1,268 @@
+import os, re, time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+
+import cv2
+import numpy as np
+
+from preprocess import PreprocessChain
+
+########################################################################
+# Plate OCR.
+# Shared preprocessing/result parsing for the desktop clients plus an
+# OcrPool that runs PaddleOCR in worker processes, one reader per process,
+# so several plate crops are recognised in parallel without the GIL.
+########################################################################
+
+# PaddleOCR runs on CPU; YOLO keeps the GPU.
+PADDLE_OCR_ARGS = dict(use_angle_cls=True, lang="en", show_log=False, rec_algorithm="SVTR_LCNet", use_gpu=False)
+
+
+# Crops recognised together in one padded recognizer batch.
+DEFAULT_REC_BATCH = 16
+
+# Which OCR path produced a plate reading.
+PATH_FAST = "fast"                # recognizer on the cheaply preprocessed crop (two-pass first pass)
+PATH_REC = "rec"                  # recognizer only on the whole YOLO crop
+PATH_FULL = "det+rec"             # PaddleOCR text detection + recognition
+PATH_FALLBACK = "rec>det+rec"     # recognizer result too weak, re-read with detection
+PATH_CACHE = "cache"              # reused from a near-identical crop (see ocr_cache.py)
+PATH_EMPTY = "empty"              # empty crop, nothing read
+
+# Crops narrower than this (width / height) are treated as two-line plates,
+# which the recognizer cannot read in one pass.
+TWO_LINE_MAX_ASPECT = 2.0
+
+# Optional plate format check for two-pass OCR: a fast-pass reading that does not
+# match goes through the heavy preprocessing pass as well. Off by default, since a
+# lane's traffic may not follow one format; INDIAN_PLATE_PATTERN is for sites that
+# only see Indian registrations (e.g. HR26CQ6869, TN01A1234, 22BH1234AB).
+DEFAULT_PLATE_PATTERN = ""
+INDIAN_PLATE_PATTERN = r"^(?:[A-Z]{2}\d{1,2}[A-Z]{0,3}\d{4}|\d{2}BH\d{4}[A-Z]{1,2})$"
+
+
+def create_reader(cpu_threads: int = None, rec_batch_num: int = DEFAULT_REC_BATCH):
+    from paddleocr import PaddleOCR
+    kwargs = dict(PADDLE_OCR_ARGS, rec_batch_num=rec_batch_num)
+    if cpu_threads:
+        kwargs["cpu_threads"] = cpu_threads
+    return PaddleOCR(**kwargs)
+
+
+def warm_up_image():
+    """Synthetic single-line plate crop used to warm up a reader before the first real plate."""
+    img = np.full((48, 200, 3), 255, np.uint8)
+    cv2.putText(img, "TN01AB1234", (6, 34), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 2, cv2.LINE_AA)
+    return img
+
+
+# Preprocessing chains for this process (see preprocess.py): the configured
+# (heavy) chain, and the cheap chain used by the first pass of two-pass OCR.
+_preprocess = PreprocessChain()
+_fast_preprocess = PreprocessChain("fast")
+
+
+def set_preprocess(spec, fast_spec=None):
+    """Use a preset name or list of stage specs for this process; returns the chain."""
+    global _preprocess, _fast_preprocess
+    _preprocess = PreprocessChain(spec)
+    if fast_spec is not None:
+        _fast_preprocess = PreprocessChain(fast_spec)
+    return _preprocess
+
+
+def preprocess_plate(plate_image, fast: bool = False):
+    return (_fast_preprocess if fast else _preprocess)(plate_image)
+
+
+def plate_format_ok(text: str, pattern: str = DEFAULT_PLATE_PATTERN) -> bool:
+    """True if text (separators removed) looks like a plate; an empty pattern accepts everything."""
+    return not pattern or re.match(pattern, re.sub(r"[^0-9A-Z]", "", text.upper())) is not None
+
+
+def as_bgr(image):
+    return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR) if image.ndim == 2 else image
+
+
+def pick_best_line(results):
+    """Highest-confidence line of a PaddleOCR result as (text, conf)."""
+    best_text, best_conf = "", 0.0
+    if results is not None and len(results) > 0 and results[0]:
+        # Simply select the result with the highest confidence, no regex or length filtering.
+        for result in results[0]:
+            if len(result) >= 2:
+                text = result[1][0]
+                confidence = round(float(result[1][1]), 2)
+                if confidence > best_conf:
+                    best_conf = confidence
+                    best_text = text.replace(" ","").strip()
+    return best_text, best_conf
+
+
+def read_plate(reader, plate_image):
+    """Preprocess and recognise one BGR plate crop; returns (text, conf) before thresholding."""
+    try:
+        return pick_best_line(reader.ocr(preprocess_plate(plate_image), cls=False))
+    except Exception as e:
+        print(f"Error in plate processing: {e}")
+        return "", 0.0
+
+
+def recognize_batch(reader, plate_images, fast: bool = False):
+    """Recognise whole plate crops as padded recognizer batches (no text detection).
+
+    Returns one (text, conf) per input, in input order; empty crops give ("", 0.0).
+    PaddleOCR's TextRecognizer pads each batch to its widest crop and restores
+    the input order itself, so the per-call overhead is paid once per batch.
+    """
+    results = [("", 0.0)] * len(plate_images)
+    prepared = []
+    for i, plate_image in enumerate(plate_images):
+        if plate_image is None or plate_image.size == 0:
+            continue
+        try:
+            prepared.append((i, as_bgr(preprocess_plate(plate_image, fast))))
+        except Exception as e:
+            print(f"Error in plate processing: {e}")
+    if not prepared:
+        return results
+    try:
+        rec_res, _ = reader.text_recognizer([img for _, img in prepared])
+    except Exception as e:
+        print(f"Error in batch recognition: {e}")
+        return results
+    for (i, _), (text, confidence) in zip(prepared, rec_res):
+        results[i] = (text.replace(" ","").strip(), round(float(confidence), 2))
+    return results
+
+
+def is_two_line(plate_image) -> bool:
+    h, w = plate_image.shape[:2]
+    return h > 0 and (w / h) < TWO_LINE_MAX_ASPECT
+
+
+def _recognize(reader, plate_images, batch: bool, fast: bool = False):
+    if batch:
+        return recognize_batch(reader, plate_images, fast)
+    return [recognize_batch(reader, [img], fast)[0] for img in plate_images]
+
+
+def read_plates(reader, plate_images, min_conf: float, rec_only: bool = True, batch: bool = True,
+                two_pass: bool = False, plate_pattern: str = DEFAULT_PLATE_PATTERN):
+    """OCR a list of crops; returns (text, conf, path) per crop in input order.
+
+    YOLO has already localised the plate, so single-line crops go straight to
+    the recognizer (batched when batch is True). Two-line plates, and
+    single-line reads below min_conf, fall back to full detection + recognition.
+    With rec_only False every crop takes the detection + recognition path.
+
+    With two_pass, single-line crops are first read with the cheap chain; only
+    readings below min_conf or not matching plate_pattern get the configured
+    (heavy) preprocessing and the steps above.
+    """
+    results = [("", 0.0, PATH_EMPTY)] * len(plate_images)
+    rec_indices = []
+    for i, plate_image in enumerate(plate_images):
+        if plate_image is None or plate_image.size == 0:
+            continue
+        if rec_only and not is_two_line(plate_image):
+            rec_indices.append(i)
+        else:
+            results[i] = read_plate(reader, plate_image) + (PATH_FULL,)
+    if two_pass and rec_indices:
+        retry = []
+        fast_results = _recognize(reader, [plate_images[i] for i in rec_indices], batch, fast=True)
+        for i, (text, conf) in zip(rec_indices, fast_results):
+            if conf >= min_conf and text and plate_format_ok(text, plate_pattern):
+                results[i] = (text, conf, PATH_FAST)
+            else:
+                retry.append(i)
+        rec_indices = retry
+    rec_results = _recognize(reader, [plate_images[i] for i in rec_indices], batch)
+    for i, (text, conf) in zip(rec_indices, rec_results):
+        if conf >= min_conf and text:
+            results[i] = (text, conf, PATH_REC)
+            continue
+        full_text, full_conf = read_plate(reader, plate_images[i])
+        if full_conf >= conf:
+            results[i] = (full_text, full_conf, PATH_FALLBACK)
+        else:
+            results[i] = (text, conf, PATH_FALLBACK)
+    return results
+
+
+# ------------------------------ Worker process side ------------------------------
+_worker_reader = None
+
+
+def _init_worker(cpu_threads: int, rec_batch_num: int, preprocess="default", fast_preprocess="fast"):
+    # Cap the math libraries before paddle is imported so N workers do not oversubscribe the CPU.
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(cpu_threads)
+    cv2.setNumThreads(1)
+    set_preprocess(preprocess, fast_preprocess)
+    global _worker_reader
+    _worker_reader = create_reader(cpu_threads, rec_batch_num)
+    # Warm up before the process takes any task, so no worker reads its first real crop cold.
+    read_plates(_worker_reader, [warm_up_image()], 0.0)
+
+
+def _worker_ready(hold: float):
+    time.sleep(hold)  # keeps this worker busy so the other idle workers take the other tasks
+    return os.getpid()
+
+
+def _worker_read_plates(plate_images, min_conf, rec_only, batch, two_pass, plate_pattern):
+    return read_plates(_worker_reader, plate_images, min_conf, rec_only, batch, two_pass, plate_pattern)
+
+
+class OcrPool:
+    """Pool of OCR worker processes, each holding its own PaddleOCR instance.
+
+    read_plates() takes a list of BGR plate crops and returns (text, conf, path) per
+    crop. The confidence threshold is passed per call since it can change at
+    runtime from the settings dialog.
+    """
+
+    def __init__(self, workers: int = 2, threads_per_worker: int = 1, rec_batch_num: int = DEFAULT_REC_BATCH,
+                 preprocess="default", fast_preprocess="fast"):
+        self.workers = max(1, int(workers))
+        self.threads_per_worker = max(1, int(threads_per_worker))
+        self.rec_batch_num = max(1, int(rec_batch_num))
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, self.rec_batch_num, preprocess, fast_preprocess),
+        )
+        # Start every worker now so the readers load in the background, not on the first plate.
+        for _ in range(self.workers):
+            self._executor.submit(os.getpid)
+
+    def warm_up(self, timeout: float = None):
+        """Block until every worker has built and warmed up its reader; returns the worker PIDs.
+        Raises TimeoutError if not all workers are ready within timeout seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pids = set()
+        while len(pids) < self.workers:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                # A worker takes tasks only once its initializer (reader + warm-up read) is done.
+                pids.update(self._executor.map(_worker_ready, [0.05] * self.workers, timeout=remaining))
+            except FuturesTimeout:  # not the builtin TimeoutError before Python 3.11
+                raise TimeoutError(f"{len(pids)} of {self.workers} OCR workers ready after {timeout}s") from None
+        return pids
+
+    def read_plates(self, plate_images, min_conf: float, rec_only: bool = True, batch: bool = True,
+                    two_pass: bool = False, plate_pattern: str = DEFAULT_PLATE_PATTERN, timeout: float = None):
+        """read_plates() in the workers. Batches of up to rec_batch_num crops go to one worker;
+        unbatched crops are spread one per task. Results keep the input order."""
+        size = self.rec_batch_num if batch else 1
+        futures = [self._executor.submit(_worker_read_plates, plate_images[i:i + size], min_conf, rec_only, batch,
+                                         two_pass, plate_pattern)
+                   for i in range(0, len(plate_images), size)]
+        results = []
+        for f in futures:
+            results.extend(f.result(timeout=timeout))
+        return results
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,223 @@
+import threading, time
+from collections import deque
+
+########################################################################
+# Staged processing pipeline.
+# Each stage runs on its own worker thread(s) and hands its output to the next
+# stage through a BoundedQueue. A full queue applies the queue's drop policy
+# instead of growing, so a slow stage caps latency rather than memory.
+########################################################################
+
+DROP_OLDEST = "drop_oldest"   # evict the oldest queued item to make room (freshest data wins)
+DROP_NEWEST = "drop_newest"   # reject the incoming item
+BLOCK = "block"               # wait for room (back-pressure to the previous stage)
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class BoundedQueue:
+    def __init__(self, maxsize: int = 2, drop_policy: str = DROP_OLDEST):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.maxsize = max(1, int(maxsize))
+        self.drop_policy = drop_policy
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, item, timeout: float = None) -> bool:
+        """Queue an item; returns False if the item itself was dropped."""
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                if self.drop_policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                elif self.drop_policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                else:
+                    if not self._cond.wait_for(lambda: self._closed or len(self._items) < self.maxsize, timeout):
+                        self.dropped += 1
+                        return False
+                    if self._closed:
+                        return False
+            self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: float = None):
+        """Next item, or None when the queue is closed or the timeout expires."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._closed or self._items, timeout):
+                return None
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def drain(self) -> list:
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            self._cond.notify_all()
+            return items
+
+    def depth(self) -> int:
+        return len(self._items)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class Stage:
+    """Runs fn on items from inbox and forwards non-None results to outbox.
+
+    A stage without an inbox is a source: fn() is polled and should block
+    briefly (e.g. waiting for the next camera frame) and return None when idle.
+
+    With max_batch > 1 the stage is batched: fn receives a list of up to
+    max_batch items (whatever is queued, plus anything arriving within
+    batch_window seconds of the first) and returns a list of results.
+    """
+
+    def __init__(self, name: str, fn, inbox: BoundedQueue = None, outbox: BoundedQueue = None, workers: int = 1,
+                 max_batch: int = 1, batch_window: float = 0.0):
+        self.name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.workers = max(1, int(workers))
+        self.max_batch = max(1, int(max_batch))
+        self.batch_window = max(0.0, float(batch_window))
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._threads = []
+
+    def start(self):
+        self._running.set()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"Stage-{self.name}-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 2.0):
+        self._running.clear()
+        if self.inbox is not None:
+            self.inbox.close()
+        for t in self._threads:
+            t.join(timeout=timeout)
+        self._threads = []
+
+    def _next_batch(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            item = self.inbox.get(timeout=max(0.0, remaining))
+            if item is None:
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while self._running.is_set():
+            if self.inbox is not None:
+                item = self.inbox.get(timeout=0.1)
+                if item is None:
+                    continue
+                if self.max_batch > 1:
+                    item = self._next_batch(item)
+            started = time.perf_counter()
+            try:
+                result = self.fn(item) if self.inbox is not None else self.fn()
+            except Exception as e:
+                print(f"[Pipeline] Error in stage '{self.name}': {e}")
+                with self._lock:
+                    self.errors += 1
+                continue
+            elapsed = time.perf_counter() - started
+            if result is None:
+                if self.inbox is None:
+                    continue  # source had nothing new; not counted as work
+            elif self.outbox is not None:
+                for out in (result if self.max_batch > 1 else (result,)):
+                    if out is not None:
+                        self.outbox.put(out, timeout=0.5)
+            with self._lock:
+                self.processed += len(item) if self.max_batch > 1 else 1
+                self.busy_seconds += elapsed
+
+    def stats(self) -> dict:
+        with self._lock:
+            avg_ms = 1000.0 * self.busy_seconds / self.processed if self.processed else 0.0
+            return {
+                "depth": self.inbox.depth() if self.inbox is not None else 0,
+                "dropped": self.inbox.dropped if self.inbox is not None else 0,
+                "processed": self.processed,
+                "errors": self.errors,
+                "avg_ms": avg_ms,
+            }
+
+
+class Pipeline:
+    """Chain of stages; the last stage's results land in self.output."""
+
+    def __init__(self, output_size: int = 4, output_policy: str = DROP_OLDEST):
+        self.stages = []
+        self.output = BoundedQueue(output_size, output_policy)
+
+    def add_source(self, name: str, fn):
+        self.stages.append(Stage(name, fn, inbox=None, outbox=self.output))
+        return self
+
+    def add_stage(self, name: str, fn, maxsize: int = 2, drop_policy: str = DROP_OLDEST, workers: int = 1,
+                  max_batch: int = 1, batch_window: float = 0.0):
+        inbox = BoundedQueue(maxsize, drop_policy)
+        if self.stages:
+            self.stages[-1].outbox = inbox
+        self.stages.append(Stage(name, fn, inbox=inbox, outbox=self.output, workers=workers,
+                                 max_batch=max_batch, batch_window=batch_window))
+        return self
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self):
+        # Stop upstream first so nothing new is queued behind a stopped stage.
+        for stage in self.stages:
+            stage.stop()
+        self.output.close()
+
+    def stats(self) -> dict:
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    def depth_summary(self) -> str:
+        return " ".join(f"{name}:{s['depth']}" for name, s in self.stats().items() if name != self.stages[0].name)
+
+
+class FrameJob:
+    """One captured frame travelling through the pipeline, plus what each stage found."""
+
+    __slots__ = ("seq", "timestamp", "frame", "fixed_area", "roi", "boxes", "track_ids", "plates", "new_detections")
+
+    def __init__(self, seq, timestamp, frame):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.frame = frame
+        self.fixed_area = False   # True when the fixed polygon (no user ROI) gated the boxes
+        self.roi = None           # RoiGeometry the boxes were found in
+        self.boxes = []           # (x1, y1, x2, y2, plate_conf) in frame coordinates
+        self.track_ids = []       # tracker ID per box
+        self.plates = []          # (box, track_id, plate_text, ocr_conf, ocr_path or None if not re-read)
+        self.new_detections = []  # (plate_id, plate_text, ocr_conf, plate_conf) to add to the table
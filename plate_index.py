@@ -0,0 +1,194 @@
+import re, threading, time
+
+import numpy as np
+import pandas as pd
+
+from dedup import CONFUSABLES, edit_distance
+
+########################################################################
+# PlateIndex: substring and fuzzy plate search over a loaded history.
+# Plates are normalised (upper case, separators removed) and the distinct
+# plates are indexed by trigram of their OCR-folded key (the dedup.py
+# folding: O/Q/D -> 0, I/L -> 1, B -> 8, ...), as sorted posting arrays.
+# A query intersects the postings of its trigrams, checks the few
+# candidates left and maps the matching plates back to rows with one
+# vectorised lookup, so it costs about the size of its answer rather than
+# a pass over every row. Exact search matches the normalised text; fuzzy
+# search matches the folded key and also whole plates within max_distance
+# edits of the query.
+# PlateSearch builds the index and answers queries on a background thread;
+# the GUI submits the latest query and polls result(), and an older query
+# still running is simply superseded.
+########################################################################
+
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+BASE = len(ALPHABET) + 1    # code 0 is padding
+CHAR_CODES = np.zeros(256, np.int64)
+CHAR_CODES[np.frombuffer(ALPHABET.encode(), np.uint8)] = np.arange(1, BASE)
+EMPTY_IDS = np.empty(0, np.int64)
+
+
+def normalize(plate) -> str:
+    return re.sub(r"[^0-9A-Z]", "", str(plate).upper())
+
+
+def fold(key: str) -> str:
+    return key.translate(CONFUSABLES)
+
+
+def trigrams(keys):
+    """(owner, trigram code) for every trigram of every normalised key."""
+    width = max(map(len, keys), default=0)
+    if width < 3:
+        return EMPTY_IDS, EMPTY_IDS
+    raw = np.frombuffer(np.array(keys, dtype=f"S{width}").tobytes(), np.uint8).reshape(len(keys), width)
+    chars = CHAR_CODES[raw]
+    a, b, c = chars[:, :-2], chars[:, 1:-1], chars[:, 2:]
+    valid = (a > 0) & (b > 0) & (c > 0)
+    owners = np.broadcast_to(np.arange(len(keys))[:, None], a.shape)[valid]
+    return owners, (a * BASE * BASE + b * BASE + c)[valid]
+
+
+class PlateIndex:
+    def __init__(self, plates, max_distance: int = 1):
+        self.max_distance = max(0, int(max_distance))
+        # Normalise each distinct raw string once, not every row. Blank cells become "" first:
+        # factorize codes a missing value -1, which would index the last plate below.
+        raw_codes, raw = pd.factorize(pd.Series(plates, dtype=object).fillna("").astype(str))
+        normalized = pd.Series(raw, dtype=object).str.upper().str.replace(r"[^0-9A-Z]", "", regex=True)
+        codes, uniques = pd.factorize(normalized)
+        self.codes = codes[raw_codes]                        # row -> distinct plate
+        self.plates = np.asarray(uniques, dtype=object)      # distinct normalised plates
+        self.keys = np.array([fold(p) for p in self.plates], dtype=object)
+        owners, grams = trigrams(list(self.keys))
+        order = np.lexsort((owners, grams))
+        owners, grams = owners[order], grams[order]
+        keep = np.ones(len(grams), bool)
+        keep[1:] = (grams[1:] != grams[:-1]) | (owners[1:] != owners[:-1])
+        self._owners = owners[keep]                          # postings, sorted by trigram then plate
+        self._grams, self._starts = np.unique(grams[keep], return_index=True)
+        self._ends = np.append(self._starts[1:], len(self._owners))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _postings(self, gram):
+        i = np.searchsorted(self._grams, gram)
+        if i == len(self._grams) or self._grams[i] != gram:
+            return EMPTY_IDS
+        return self._owners[self._starts[i]:self._ends[i]]
+
+    def _containing(self, query: str, folded: str, fuzzy: bool):
+        """Distinct plates containing the query (its folded key when fuzzy)."""
+        grams = np.unique(trigrams([folded])[1])
+        if len(grams):
+            postings = sorted((self._postings(g) for g in grams), key=len)
+            candidates = postings[0]
+            for other in postings[1:]:
+                if not len(candidates):
+                    break
+                candidates = np.intersect1d(candidates, other, assume_unique=True)
+        else:
+            candidates = np.arange(len(self.plates))  # 1-2 characters: check every distinct plate
+        if not len(candidates):
+            return EMPTY_IDS
+        texts = self.keys if fuzzy else self.plates
+        found = pd.Series(texts[candidates]).str.contains(folded if fuzzy else query, regex=False).to_numpy()
+        return candidates[found]
+
+    def _near(self, folded: str):
+        """Distinct plates whose folded key is within max_distance edits of the whole query."""
+        grams = np.unique(trigrams([folded])[1])
+        # One edit changes at most three trigrams, so a match shares at least this many with the query.
+        needed = len(grams) - 3 * self.max_distance
+        if not self.max_distance or needed < 1:
+            return EMPTY_IDS
+        ids, counts = np.unique(np.concatenate([self._postings(g) for g in grams]), return_counts=True)
+        return np.array([i for i in ids[counts >= needed]
+                         if edit_distance(self.keys[i], folded, self.max_distance) <= self.max_distance], np.int64)
+
+    def search(self, query: str, fuzzy: bool = False):
+        """Row numbers (ascending) whose plate matches query."""
+        query = normalize(query)
+        if not query:
+            return np.arange(len(self.codes))
+        folded = fold(query)
+        plates = self._containing(query, folded, fuzzy)
+        if fuzzy:
+            plates = np.union1d(plates, self._near(folded))
+        wanted = np.zeros(len(self.plates), bool)
+        wanted[plates] = True
+        return np.flatnonzero(wanted[self.codes])
+
+
+class PlateSearch:
+    def __init__(self, max_distance: int = 1):
+        self.max_distance = max_distance
+        self.index = PlateIndex([], max_distance)   # answers queries (no rows) until set_plates()
+        self._plates = None      # plates waiting to be indexed
+        self._query = None       # (serial, text, fuzzy) waiting to run
+        self._result = None      # (serial, rows, seconds) of the last finished query
+        self._serial = 0
+        self._building = False
+        self._closed = False
+        self._cond = threading.Condition()
+        threading.Thread(target=self._run, name="PlateSearch", daemon=True).start()
+
+    def set_plates(self, plates):
+        """Index a new dataset; queries submitted after this run against it."""
+        with self._cond:
+            self._plates = plates
+            self._building = True
+            self._cond.notify()
+
+    def submit(self, text: str, fuzzy: bool = False) -> int:
+        """Queue a query, replacing any not yet started; returns its serial for result()."""
+        with self._cond:
+            self._serial += 1
+            self._query = (self._serial, text, fuzzy)
+            self._cond.notify()
+            return self._serial
+
+    def result(self):
+        with self._cond:
+            return self._result
+
+    def building(self) -> bool:
+        with self._cond:
+            return self._building
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and self._plates is None and self._query is None:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                plates, self._plates = self._plates, None
+                query = None
+                if plates is None:
+                    query, self._query = self._query, None
+            if plates is not None:
+                try:
+                    index = PlateIndex(plates, self.max_distance)
+                except Exception as e:
+                    print(f"[Search] Indexing failed: {e}")
+                    index = PlateIndex([], self.max_distance)
+                with self._cond:
+                    self.index = index
+                    self._building = self._plates is not None
+                continue
+            serial, text, fuzzy = query
+            started = time.perf_counter()
+            try:
+                rows = self.index.search(text, fuzzy)
+            except Exception as e:
+                print(f"[Search] Query {text!r} failed: {e}")
+                rows = EMPTY_IDS
+            with self._cond:
+                self._result = (serial, rows, time.perf_counter() - started)
@@ -0,0 +1,235 @@
+import os, sys, time
+from collections import Counter
+
+import cv2
+
+########################################################################
+# Plate crop preprocessing for OCR.
+# A chain is a list of named stages, each built once with its parameters
+# (e.g. the CLAHE object is created when the chain is built, not per crop):
+#     ["gray", "clahe:clip_limit=2.0", "resize:fx=1.5", "nlmeans:h=15"]
+# or the name of a preset from PRESETS. Every chain records how long each
+# stage took so slow stages show up; `python preprocess.py` benchmarks
+# chains on real crops (ms/crop and OCR agreement with the reference chain).
+########################################################################
+
+INTERPOLATIONS = {
+    "nearest": cv2.INTER_NEAREST,
+    "linear": cv2.INTER_LINEAR,
+    "cubic": cv2.INTER_CUBIC,
+    "area": cv2.INTER_AREA,
+}
+
+
+def _gray():
+    return lambda img: cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+
+
+def _clahe(clip_limit=2.0, tile=8):
+    # Brightness normalisation for bright areas; needs a grey image.
+    return cv2.createCLAHE(clipLimit=float(clip_limit), tileGridSize=(int(tile), int(tile))).apply
+
+
+def _resize(fx=1.5, interpolation="cubic"):
+    fx, inter = float(fx), INTERPOLATIONS[interpolation]
+    return lambda img: cv2.resize(img, None, fx=fx, fy=fx, interpolation=inter)
+
+
+def _resize_height(height=48, interpolation="linear"):
+    # The recognizer works on 48 px high lines, so larger crops are wasted work downstream.
+    height, inter = int(height), INTERPOLATIONS[interpolation]
+
+    def resize(img):
+        h, w = img.shape[:2]
+        if h == 0 or h == height:
+            return img
+        return cv2.resize(img, (max(1, int(round(w * height / float(h)))), height), interpolation=inter)
+    return resize
+
+
+def _nlmeans(h=15, search=21, template=7):
+    h, search, template = float(h), int(search), int(template)
+    return lambda img: cv2.fastNlMeansDenoising(img, None, h=h, searchWindowSize=search, templateWindowSize=template)
+
+
+def _bilateral(d=5, sigma_color=50, sigma_space=50):
+    d, sigma_color, sigma_space = int(d), float(sigma_color), float(sigma_space)
+    return lambda img: cv2.bilateralFilter(img, d, sigma_color, sigma_space)
+
+
+def _median(ksize=3):
+    ksize = int(ksize)
+    return lambda img: cv2.medianBlur(img, ksize)
+
+
+def _noop():
+    return lambda img: img
+
+
+STAGES = {
+    "gray": _gray,
+    "clahe": _clahe,
+    "resize": _resize,
+    "resize_height": _resize_height,
+    "nlmeans": _nlmeans,
+    "bilateral": _bilateral,
+    "median": _median,
+    "noop": _noop,
+}
+
+# "default" is the original CLAHE + 1.5x cubic + NLMeans chain.
+PRESETS = {
+    "default": ["gray", "clahe", "resize:fx=1.5", "nlmeans:h=15"],
+    "bilateral": ["gray", "clahe", "resize:fx=1.5", "bilateral"],
+    "median": ["gray", "clahe", "resize:fx=1.5", "median:ksize=3"],
+    "clahe": ["gray", "clahe", "resize_height:height=48"],
+    "fast": ["gray", "resize_height:height=48"],
+    "none": ["noop"],
+}
+
+
+def _value(text: str):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_stage(spec: str):
+    """"name:key=value,key=value" -> (name, kwargs)."""
+    name, _, args = spec.partition(":")
+    kwargs = {}
+    for arg in filter(None, args.split(",")):
+        key, sep, value = arg.partition("=")
+        if not sep:
+            raise ValueError(f"Bad preprocessing argument '{arg}' in '{spec}'")
+        kwargs[key.strip()] = _value(value.strip())
+    return name.strip(), kwargs
+
+
+def resolve(spec):
+    """Preset name or list of stage specs -> list of stage specs."""
+    if isinstance(spec, str):
+        if spec not in PRESETS:
+            raise ValueError(f"Unknown preprocessing preset: {spec}")
+        return list(PRESETS[spec])
+    return list(spec)
+
+
+class PreprocessChain:
+    def __init__(self, spec="default"):
+        self.spec = resolve(spec)
+        self.stages = []
+        for stage in self.spec:
+            name, kwargs = parse_stage(stage)
+            if name not in STAGES:
+                raise ValueError(f"Unknown preprocessing stage: {name}")
+            try:
+                self.stages.append((stage, STAGES[name](**kwargs)))
+            except (TypeError, KeyError) as e:
+                raise ValueError(f"Bad preprocessing stage '{stage}': {e}")
+        self.reset_timings()
+
+    def __call__(self, image):
+        for i, (_, fn) in enumerate(self.stages):
+            started = time.perf_counter()
+            image = fn(image)
+            self._seconds[i] += time.perf_counter() - started
+        self.crops += 1
+        return image
+
+    def reset_timings(self):
+        self.crops = 0
+        self._seconds = [0.0] * len(self.stages)
+
+    def timings(self) -> dict:
+        """Average ms per crop for each stage, in chain order."""
+        return {stage: 1000.0 * secs / self.crops if self.crops else 0.0
+                for (stage, _), secs in zip(self.stages, self._seconds)}
+
+    def __repr__(self):
+        return " > ".join(self.spec)
+
+
+########################################################################
+# Benchmark: replay plate crops through each chain and the OCR reader.
+#   python preprocess.py --crops data_log/crops
+#   python preprocess.py --video sample_video --weights model/best.pt
+# The first chain is the reference for agreement (default: "default").
+########################################################################
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def load_crops(folder: str):
+    return [img for img in (cv2.imread(os.path.join(folder, f)) for f in sorted(os.listdir(folder))
+                            if f.lower().endswith(IMAGE_EXTENSIONS)) if img is not None]
+
+
+def crops_from_video(sources, weights: str, frames: int, conf: float):
+    from detector import create_detector, sample_frames
+    detector = create_detector(weights)
+    crops = []
+    for frame in sample_frames(sources, frames):
+        for x1, y1, x2, y2, score, _ in detector.detect(frame):
+            if score >= conf:
+                crop = frame[max(int(y1), 0):int(y2), max(int(x1), 0):int(x2)]
+                if crop.size:
+                    crops.append(crop)
+    return crops
+
+
+def benchmark(crops, chains, min_conf: float = 0.4, rec_only: bool = True, two_pass: bool = False):
+    import ocr_engine
+    reader = ocr_engine.create_reader()
+    reference = None
+    rows = []
+    for name in chains:
+        chain = ocr_engine.set_preprocess(name)
+        ocr_engine.read_plates(reader, crops[:1], min_conf, rec_only)  # warm-up
+        chain.reset_timings()
+        started = time.perf_counter()
+        results = []
+        for i in range(0, len(crops), ocr_engine.DEFAULT_REC_BATCH):
+            results.extend(ocr_engine.read_plates(reader, crops[i:i + ocr_engine.DEFAULT_REC_BATCH], min_conf,
+                                                  rec_only, two_pass=two_pass))
+        total_ms = 1000.0 * (time.perf_counter() - started) / len(crops)
+        texts = [text if conf >= min_conf else "" for text, conf, _ in results]
+        if reference is None:
+            reference = texts
+        compared = [(ref, text) for ref, text in zip(reference, texts) if ref]
+        agreement = sum(ref == text for ref, text in compared) / len(compared) if compared else 0.0
+        read_rate = sum(bool(t) for t in texts) / len(texts)
+        stage_ms = chain.timings()
+        rows.append((name, sum(stage_ms.values()), total_ms, agreement, read_rate))
+        print(f"\n[{name}] {chain}")
+        for stage, ms in stage_ms.items():
+            print(f"    {stage:<28}{ms:7.2f} ms/crop")
+        if two_pass:
+            paths = Counter(path for _, _, path in results)
+            print("    decided by: " + ", ".join(f"{path} {n}" for path, n in paths.most_common()))
+    print(f"\n==== Preprocessing benchmark: {len(crops)} crops, reference '{chains[0]}' ====")
+    print(f"{'chain':<12}{'prep ms':>9}{'total ms':>10}{'agree':>8}{'read':>8}")
+    for name, prep_ms, total_ms, agreement, read_rate in rows:
+        print(f"{name:<12}{prep_ms:9.2f}{total_ms:10.2f}{100 * agreement:7.1f}%{100 * read_rate:7.1f}%")
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark plate preprocessing chains")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--crops", help="folder of plate crop images")
+    source.add_argument("--video", nargs="+", metavar="VIDEO_OR_DIR", help="detect crops in these videos")
+    parser.add_argument("--weights", default=os.path.join("model", "best.pt"))
+    parser.add_argument("--frames", type=int, default=200, help="frames to sample with --video")
+    parser.add_argument("--chains", nargs="+", default=list(PRESETS), help="presets to compare; the first is the reference")
+    parser.add_argument("--min-conf", type=float, default=0.4, help="OCR confidence threshold")
+    parser.add_argument("--two-pass", action="store_true", help="read with the fast chain first (as ocr_two_pass)")
+    args = parser.parse_args()
+    crops = load_crops(args.crops) if args.crops else crops_from_video(args.video, args.weights, args.frames, 0.4)
+    if not crops:
+        sys.exit("No plate crops to benchmark")
+    benchmark(crops, args.chains, args.min_conf, two_pass=args.two_pass)
@@ -0,0 +1,106 @@
+import threading
+
+import cv2
+import numpy as np
+
+########################################################################
+# ROI geometry.
+# The detect stage needs the ROI in frame pixels: the polygon, its bounding
+# rect clamped to the frame, a rasterised inclusion mask and the clamp
+# limits for padded boxes. RoiGeometry computes all of that once and
+# RoiCache keeps it until the ROI or the frame size changes, instead of
+# rebuilding it on every frame.
+# filter_boxes() post-processes a whole (N, 6) detector output at once with
+# NumPy: confidence filter, crop offset, padding, clamping and polygon
+# inclusion by mask lookup.
+# User ROIs are stored normalised to the video image (0..1 of the frame),
+# so they map to the same frame pixels whatever size the window is.
+########################################################################
+
+EMPTY_BOXES = np.zeros((0, 5), np.float32)
+
+
+class RoiGeometry:
+    __slots__ = ("polygon", "rect", "mask", "limits")
+
+    def __init__(self, polygon, frame_size):
+        frame_width, frame_height = frame_size
+        self.polygon = np.asarray(polygon, np.int32).reshape(-1, 2)
+        x, y, w, h = cv2.boundingRect(self.polygon)
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + w, frame_width), min(y + h, frame_height)
+        self.rect = (x1, y1, max(0, x2 - x1), max(0, y2 - y1))
+        mask = np.zeros((frame_height, frame_width), np.uint8)
+        cv2.fillPoly(mask, [self.polygon], 1)
+        self.mask = mask.astype(bool)
+        self.limits = (frame_width, frame_height)  # box corners are clamped to [0, limit]
+
+    @classmethod
+    def from_normalized(cls, points, frame_size):
+        frame_width, frame_height = frame_size
+        return cls([(round(nx * frame_width), round(ny * frame_height)) for nx, ny in points], frame_size)
+
+    def is_empty(self) -> bool:
+        return self.rect[2] <= 0 or self.rect[3] <= 0
+
+    def contains(self, x: int, y: int) -> bool:
+        """True if frame pixel (x, y) lies inside the polygon (edges included)."""
+        return 0 <= x < self.limits[0] and 0 <= y < self.limits[1] and bool(self.mask[y, x])
+
+    def filter_boxes(self, detections, conf_threshold: float, offset=(0, 0), padding: int = 0,
+                     inside: bool = False) -> np.ndarray:
+        """Accepted boxes as a compact (K, 5) float32 array of x1, y1, x2, y2, conf in frame pixels.
+
+        detections are (N, 6) rows x1, y1, x2, y2, conf, class relative to a crop at offset.
+        Boxes below conf_threshold are dropped; with inside, so are boxes whose centre is
+        outside the polygon. Corners are truncated to whole pixels, shifted by offset,
+        padded and clamped to the frame.
+        """
+        det = np.asarray(detections, np.float32)
+        if det.size == 0:
+            return EMPTY_BOXES
+        det = det[det[:, 4] >= conf_threshold]
+        if len(det) == 0:
+            return EMPTY_BOXES
+        corners = det[:, :4].astype(np.int32) + np.array([offset[0], offset[1], offset[0], offset[1]], np.int32)
+        if inside:
+            cx = (corners[:, 0] + corners[:, 2]) // 2
+            cy = (corners[:, 1] + corners[:, 3]) // 2
+            in_frame = (cx >= 0) & (cx < self.limits[0]) & (cy >= 0) & (cy < self.limits[1])
+            keep = in_frame.copy()
+            keep[in_frame] = self.mask[cy[in_frame], cx[in_frame]]
+            corners, det = corners[keep], det[keep]
+        corners[:, :2] -= padding
+        corners[:, 2:] += padding
+        corners[:, [0, 2]] = corners[:, [0, 2]].clip(0, self.limits[0])
+        corners[:, [1, 3]] = corners[:, [1, 3]].clip(0, self.limits[1])
+        return np.concatenate([corners.astype(np.float32), det[:, 4:5]], axis=1)
+
+
+def box_tuples(boxes: np.ndarray) -> list:
+    """filter_boxes() output as (x1, y1, x2, y2, conf) tuples with int corners, as FrameJob.boxes holds them."""
+    return [(int(x1), int(y1), int(x2), int(y2), float(conf)) for x1, y1, x2, y2, conf in boxes.tolist()]
+
+
+class RoiCache:
+    """Last RoiGeometry, rebuilt only when the ROI points or the frame size change."""
+
+    def __init__(self):
+        self._key = None
+        self._geometry = None
+        self.rebuilds = 0
+        self._lock = threading.Lock()
+
+    def get(self, points, frame_size, normalized: bool = False) -> RoiGeometry:
+        key = (points, tuple(frame_size), normalized)
+        with self._lock:
+            if key != self._key:
+                build = RoiGeometry.from_normalized if normalized else RoiGeometry
+                self._geometry = build(points, frame_size)
+                self._key = key
+                self.rebuilds += 1
+            return self._geometry
+
+    def invalidate(self):
+        with self._lock:
+            self._key = None
@@ -0,0 +1,14 @@
+import numpy as np
+import pandas as pd
+
+from plate_index import PlateIndex
+
+
+def test_blank_plate_cells_match_nothing():
+    # None / NaN / pd.NA cells must not take the code of another plate.
+    for blank in (None, np.nan, pd.NA):
+        index = PlateIndex(["TN01AB1234", blank, "KA05CD5678"])
+        assert index.search("KA05CD5678").tolist() == [2]
+        assert index.search("TN01").tolist() == [0]
+        assert index.search("KA05CD5678", fuzzy=True).tolist() == [2]
+        assert index.search("").tolist() == [0, 1, 2]
@@ -0,0 +1,224 @@
+import threading, time
+from collections import defaultdict
+
+########################################################################
+# PlateTracker: IoU/centroid multi-object tracker between YOLO and OCR.
+# Each plate box gets a persistent track ID so OCR can run a bounded number
+# of times per physical plate instead of once per frame, and the track ID
+# doubles as the Plate ID shown on screen and written to the CSV log.
+# Readings of one track are merged by character-position voting, so e.g.
+# 66-HH-07 / 66-HH-O7 from consecutive frames resolve to a single plate.
+########################################################################
+
+
+def box_iou(a, b) -> float:
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    if inter <= 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / float(area_a + area_b - inter)
+
+
+def centroid_distance(a, b) -> float:
+    """Distance between box centres, relative to the diagonal of box a."""
+    ax, ay = (a[0] + a[2]) / 2.0, (a[1] + a[3]) / 2.0
+    bx, by = (b[0] + b[2]) / 2.0, (b[1] + b[3]) / 2.0
+    diag = max(1.0, ((a[2] - a[0]) ** 2 + (a[3] - a[1]) ** 2) ** 0.5)
+    return ((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5 / diag
+
+
+class PlateVote:
+    """Confidence-weighted character-position voting over the OCR readings of one track.
+
+    The winning length is the one with the most total confidence; each position
+    then takes the character with the most confidence among readings of that
+    length. The margin is the smallest lead (in summed confidence) of any
+    winner over its runner-up, length included, so one disputed character
+    keeps the whole plate unsettled.
+    """
+
+    __slots__ = ("readings",)
+
+    def __init__(self):
+        self.readings = []  # (text, conf)
+
+    def add(self, text: str, conf: float):
+        self.readings.append((text, conf))
+
+    def consensus(self):
+        """(text, conf, margin) of the current vote; ("", 0.0, 0.0) with no readings."""
+        if not self.readings:
+            return "", 0.0, 0.0
+        by_length = defaultdict(float)
+        for text, conf in self.readings:
+            by_length[len(text)] += conf
+        ranked = sorted(by_length.values(), reverse=True)
+        margin = ranked[0] - (ranked[1] if len(ranked) > 1 else 0.0)
+        length = max(by_length, key=by_length.get)
+        same_length = [(text, conf) for text, conf in self.readings if len(text) == length]
+        chars = []
+        for pos in range(length):
+            weights = defaultdict(float)
+            for text, conf in same_length:
+                weights[text[pos]] += conf
+            top = sorted(weights.values(), reverse=True)
+            margin = min(margin, top[0] - (top[1] if len(top) > 1 else 0.0))
+            chars.append(max(weights, key=weights.get))
+        text = "".join(chars)
+        confs = [conf for t, conf in same_length if t == text] or [conf for _, conf in same_length]
+        return text, round(sum(confs) / len(confs), 2), margin
+
+
+class Track:
+    __slots__ = ("track_id", "box", "first_seen", "last_seen", "hits", "plate_conf", "votes",
+                 "text", "text_conf", "margin", "confirmed", "ocr_count", "last_ocr_time", "logged")
+
+    def __init__(self, track_id, box, now, plate_conf=0.0):
+        self.track_id = track_id
+        self.box = box
+        self.first_seen = now
+        self.last_seen = now
+        self.hits = 1
+        self.plate_conf = plate_conf  # best YOLO confidence seen on this track
+        self.votes = PlateVote()
+        self.text = ""                # current consensus text
+        self.text_conf = 0.0
+        self.margin = 0.0
+        self.confirmed = False        # consensus margin reached; no more OCR needed
+        self.ocr_count = 0
+        self.last_ocr_time = None
+        self.logged = False           # already written to the detection log
+
+
+class PlateTracker:
+    """Greedy IoU matcher with a centroid-distance fallback for small/fast boxes.
+
+    Thread-safe: update() runs on the detect stage, claim_ocr()/record_ocr()
+    on the OCR stage and take_ready()/pop_finished() on the sink.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_centroid_distance: float = 0.75,
+                 max_age: float = 1.0, ocr_interval: float = 0.5, max_ocr_per_track: int = 10,
+                 consensus_margin: float = 1.5, first_id: int = 1):
+        self.iou_threshold = iou_threshold
+        self.max_centroid_distance = max_centroid_distance
+        self.max_age = max_age                  # seconds a track survives without a matching box
+        self.ocr_interval = ocr_interval        # minimum seconds between OCR runs on one track
+        self.max_ocr_per_track = max_ocr_per_track
+        self.consensus_margin = consensus_margin  # summed-confidence lead that settles a plate
+        self.tracks = {}
+        self.finished = []                      # expired tracks with an unlogged reading
+        self.next_id = first_id
+        self.ocr_skipped = 0
+        self._lock = threading.Lock()
+
+    def reset(self, first_id: int = 1):
+        with self._lock:
+            self.tracks.clear()
+            self.finished.clear()
+            self.next_id = first_id
+
+    def seed_next_id(self, last_id: int):
+        """Continue numbering after last_id (e.g. the highest Plate ID already in today's CSV)."""
+        with self._lock:
+            self.next_id = max(self.next_id, int(last_id) + 1)
+
+    def update(self, boxes, now: float = None):
+        """Match (x1, y1, x2, y2, ...) boxes to tracks; returns a track ID per box, in order."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for tid in [tid for tid, t in self.tracks.items() if now - t.last_seen > self.max_age]:
+                track = self.tracks.pop(tid)
+                if track.text and not track.logged:
+                    self.finished.append(track)
+            candidates = []
+            for bi, box in enumerate(boxes):
+                for tid, track in self.tracks.items():
+                    iou = box_iou(track.box, box)
+                    if iou >= self.iou_threshold:
+                        candidates.append((1.0 + iou, bi, tid))
+                    else:
+                        dist = centroid_distance(track.box, box)
+                        if dist <= self.max_centroid_distance:
+                            candidates.append((1.0 - dist, bi, tid))
+            candidates.sort(reverse=True)
+            assigned = [None] * len(boxes)
+            used_tracks = set()
+            for _, bi, tid in candidates:
+                if assigned[bi] is not None or tid in used_tracks:
+                    continue
+                assigned[bi] = tid
+                used_tracks.add(tid)
+                track = self.tracks[tid]
+                track.box = tuple(boxes[bi][:4])
+                track.last_seen = now
+                track.hits += 1
+                if len(boxes[bi]) > 4:
+                    track.plate_conf = max(track.plate_conf, float(boxes[bi][4]))
+            for bi, box in enumerate(boxes):
+                if assigned[bi] is None:
+                    tid = self.next_id
+                    self.next_id += 1
+                    self.tracks[tid] = Track(tid, tuple(box[:4]), now, float(box[4]) if len(box) > 4 else 0.0)
+                    assigned[bi] = tid
+            return assigned
+
+    def get(self, track_id):
+        with self._lock:
+            return self.tracks.get(track_id)
+
+    def claim_ocr(self, track_id, now: float = None) -> bool:
+        """True if the track is due for OCR; the caller must then run it and record_ocr()."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            track = self.tracks.get(track_id)
+            if track is None:
+                return False
+            due = (not track.confirmed
+                   and track.ocr_count < self.max_ocr_per_track
+                   and (track.last_ocr_time is None or now - track.last_ocr_time >= self.ocr_interval))
+            if not due:
+                self.ocr_skipped += 1
+                return False
+            track.ocr_count += 1
+            track.last_ocr_time = now
+            return True
+
+    def record_ocr(self, track_id, text: str, conf: float):
+        """Add an OCR reading to the track's vote; returns the consensus (text, conf)."""
+        with self._lock:
+            track = self.tracks.get(track_id)
+            if track is None:
+                return text, conf
+            if text:
+                track.votes.add(text, conf)
+                track.text, track.text_conf, track.margin = track.votes.consensus()
+                if track.margin >= self.consensus_margin:
+                    track.confirmed = True
+            return track.text, track.text_conf
+
+    def take_ready(self, track_id):
+        """The track, once, when its reading is final: consensus reached or OCR budget spent."""
+        with self._lock:
+            track = self.tracks.get(track_id)
+            if track is None or track.logged or not track.text:
+                return None
+            if not (track.confirmed or track.ocr_count >= self.max_ocr_per_track):
+                return None
+            track.logged = True
+            return track
+
+    def pop_finished(self):
+        """Tracks that left the scene before their reading was final; logged with the vote so far."""
+        with self._lock:
+            finished, self.finished = self.finished, []
+            for track in finished:
+                track.logged = True
+            return finished
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"active": len(self.tracks), "ocr_skipped": self.ocr_skipped, "next_id": self.next_id}